@@ -12,3 +12,7 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
 
 application = get_asgi_application()
+
+from home.agraph_clients import prewarm_clients  # noqa: E402
+
+prewarm_clients()
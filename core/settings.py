@@ -118,6 +118,82 @@ else:
         }
     }
 
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+
+PROFILE_CACHE_TIMEOUT = int(os.getenv("PROFILE_CACHE_TIMEOUT", 300))
+PROFILE_CACHE_MAX_ENTRIES = int(os.getenv("PROFILE_CACHE_MAX_ENTRIES", 1000))
+CARD_CACHE_TIMEOUT = int(os.getenv("CARD_CACHE_TIMEOUT", 3600))
+CARD_CACHE_MAX_ENTRIES = int(os.getenv("CARD_CACHE_MAX_ENTRIES", 5000))
+# Bump whenever the readonly card templates change, so fragments rendered with the old ones are not served
+CARD_TEMPLATE_VERSION = os.getenv("CARD_TEMPLATE_VERSION", "1")
+
+# The profile and card caches are shared by every process: web workers, drain_graph_outbox, create_users... so an
+# invalidation made by any of them reaches all the others. The default DatabaseCache needs no extra service, its tables
+# are created by `python manage.py createcachetable`, but it has two costs:
+# - Every cache hit is a database query.
+# - Its eviction is NOT LRU. Past MAX_ENTRIES it deletes the expired entries, then a third of the rest in key order,
+#   regardless of how recently they were read.
+# For LRU eviction and cache hits off the database, point CACHE_BACKEND and the *_CACHE_LOCATION variables to Redis
+# (django.core.cache.backends.redis.RedisCache, redis://..., needs the redis package) configured with
+# `maxmemory-policy allkeys-lru`.
+# Do not use LocMemCache with more than one process: each process would keep its own copy and miss the invalidations
+# of the others, serving stale profiles and cards until their TTL runs out.
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "django.core.cache.backends.db.DatabaseCache")
+PROFILE_CACHE_LOCATION = os.getenv("PROFILE_CACHE_LOCATION", "profile_cache")
+CARD_CACHE_LOCATION = os.getenv("CARD_CACHE_LOCATION", "card_cache")
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # Assembled profile page contexts. MAX_ENTRIES bounds the database and in-memory backends, Redis and Memcached
+    # rely on their own eviction.
+    "profiles": {
+        "BACKEND": CACHE_BACKEND,
+        "LOCATION": PROFILE_CACHE_LOCATION,
+        "KEY_PREFIX": "profiles",
+        "TIMEOUT": PROFILE_CACHE_TIMEOUT,
+        "OPTIONS": {
+            "MAX_ENTRIES": PROFILE_CACHE_MAX_ENTRIES,
+        },
+    },
+    # Rendered readonly card fragments
+    "cards": {
+        "BACKEND": CACHE_BACKEND,
+        "LOCATION": CARD_CACHE_LOCATION,
+        "KEY_PREFIX": "cards",
+        "TIMEOUT": CARD_CACHE_TIMEOUT,
+        "OPTIONS": {
+            "MAX_ENTRIES": CARD_CACHE_MAX_ENTRIES,
+        },
+    },
+}
+
+# Size of each of the memos of the URI helpers (encode_uri, decode_uri, get_label_from_uri)
+URI_CACHE_MAX_ENTRIES = int(os.getenv("URI_CACHE_MAX_ENTRIES", 10000))
+
+# Number of cards rendered per page in the activity log, created cards and tagged-in sections of a profile
+PROFILE_SECTION_PAGE_SIZE = int(os.getenv("PROFILE_SECTION_PAGE_SIZE", 20))
+
+# Graph queries
+# Independent AllegroGraph queries of a request run concurrently on a bounded per-process thread pool.
+
+GRAPH_QUERY_MAX_WORKERS = int(os.getenv("GRAPH_QUERY_MAX_WORKERS", 8))
+GRAPH_QUERY_TIMEOUT = float(os.getenv("GRAPH_QUERY_TIMEOUT", 10))
+
+# Each process keeps a pool of AllegroGraph clients, each one holding its own kept-alive connection.
+AGRAPH_POOL_SIZE = int(os.getenv("AGRAPH_POOL_SIZE", GRAPH_QUERY_MAX_WORKERS))
+AGRAPH_POOL_TIMEOUT = float(os.getenv("AGRAPH_POOL_TIMEOUT", 5))
+AGRAPH_POOL_PREWARM = os.environ.get("AGRAPH_POOL_PREWARM", "False") in ["True", True, 1]
+
+# Graph backend. Point both managers to home.fake_agraph.FakeUserManager/FakeAgraphManager to use the in-memory one.
+AGRAPH_USER_MANAGER = os.getenv("AGRAPH_USER_MANAGER", "home.agraph.user_manager.UserManager")
+AGRAPH_MANAGER = os.getenv("AGRAPH_MANAGER", "home.agraph.agraph_manager.AgraphManager")
+# Seconds each call to the in-memory backend takes, and JSON file it is loaded from
+AGRAPH_FAKE_LATENCY = float(os.getenv("AGRAPH_FAKE_LATENCY", 0))
+AGRAPH_FAKE_DATA = os.getenv("AGRAPH_FAKE_DATA")
+
 # Logging
 
 LOGGING = {
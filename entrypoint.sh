@@ -4,6 +4,10 @@
 echo "Migrating database..."
 python manage.py migrate
 
+# Create the tables of the database cache backend (no-op for other backends)
+echo "Creating cache tables..."
+python manage.py createcachetable
+
 # Load graph data
 echo "Loading graph db data..."
 python manage.py load_agraph
@@ -20,6 +24,10 @@ python manage.py update_users
 echo "Creating cards..."
 python manage.py create_cards
 
+# Count the cards of the profiles that have no contribution counts yet
+echo "Backfilling contribution counts..."
+python manage.py backfill_contribution_counts
+
 # Collect static files
 echo "Collecting static files..."
 python manage.py collectstatic --no-input
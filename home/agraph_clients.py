@@ -0,0 +1,33 @@
+"""Per-process AllegroGraph clients shared by every view and command.
+
+The manager classes are read from the ``AGRAPH_USER_MANAGER``/``AGRAPH_MANAGER`` settings, so an in-memory backend
+(``home.fake_agraph``) can replace AllegroGraph for local benchmarks and tests.
+"""
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from home.client_pool import ClientPool
+from home.client_pool import PooledClient
+
+user_manager_pool = ClientPool(
+    import_string(settings.AGRAPH_USER_MANAGER),
+    size=settings.AGRAPH_POOL_SIZE,
+    timeout=settings.AGRAPH_POOL_TIMEOUT,
+    name="user_manager",
+)
+agraph_manager_pool = ClientPool(
+    import_string(settings.AGRAPH_MANAGER),
+    size=settings.AGRAPH_POOL_SIZE,
+    timeout=settings.AGRAPH_POOL_TIMEOUT,
+    name="agraph_manager",
+)
+
+user_manager = PooledClient(user_manager_pool)
+agraph_manager = PooledClient(agraph_manager_pool)
+
+
+def prewarm_clients() -> None:
+    """Open the pooled AllegroGraph clients at startup when ``AGRAPH_POOL_PREWARM`` is enabled."""
+    if settings.AGRAPH_POOL_PREWARM:
+        user_manager_pool.prewarm()
+        agraph_manager_pool.prewarm()
@@ -0,0 +1,70 @@
+"""Cache of rendered readonly card fragments.
+
+Fragments are keyed on the card id and ``CARD_TEMPLATE_VERSION``, so bumping the version after changing the readonly
+templates discards every fragment rendered with the old ones. The ``cards`` alias is shared by every process (see
+``CACHES`` in settings). Any code path that edits a card in the graph must call ``invalidate_card_fragment``, which
+``home.graph_writes.record_card_write`` does.
+"""
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import Awaitable
+from typing import Callable
+
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+CARD_CACHE_ALIAS = "cards"
+
+
+@dataclass
+class CardFragment:
+    html: str
+    etag: str
+
+
+def _card_fragment_key(card_id: str) -> str:
+    return f"card_fragment:{settings.CARD_TEMPLATE_VERSION}:{card_id}"
+
+
+def get_or_render_card_fragment(card_id: str, render: Callable[[], str]) -> CardFragment:
+    """Return the cached readonly fragment of a card, rendering and storing it on a miss.
+
+    Args:
+        card_id (str): The card identifier in AllegroGraph.
+        render (Callable): Callable that renders the readonly card HTML.
+
+    Returns:
+        CardFragment: The rendered HTML and its ETag.
+    """
+    cache = caches[CARD_CACHE_ALIAS]
+    key = _card_fragment_key(card_id)
+    fragment = cache.get(key)
+    if fragment is None:
+        logger.debug(f"Card fragment cache miss for {card_id}")
+        fragment = _make_fragment(render())
+        cache.set(key, fragment)
+    return fragment
+
+
+async def aget_or_render_card_fragment(card_id: str, render: Callable[[], Awaitable[str]]) -> CardFragment:
+    """Async version of ``get_or_render_card_fragment``, taking a coroutine function as the renderer."""
+    cache = caches[CARD_CACHE_ALIAS]
+    key = _card_fragment_key(card_id)
+    fragment = await cache.aget(key)
+    if fragment is None:
+        logger.debug(f"Card fragment cache miss for {card_id}")
+        fragment = _make_fragment(await render())
+        await cache.aset(key, fragment)
+    return fragment
+
+
+def _make_fragment(html: str) -> CardFragment:
+    return CardFragment(html=html, etag=f'"{hashlib.md5(html.encode()).hexdigest()}"')
+
+
+def invalidate_card_fragment(card_id: str) -> None:
+    """Drop the rendered fragment of a card after it was edited in the graph."""
+    caches[CARD_CACHE_ALIAS].delete(_card_fragment_key(card_id))
@@ -0,0 +1,85 @@
+"""Cache of fully assembled profile page contexts.
+
+Contexts are keyed on the profile's ``graph_id`` and live in the ``profiles`` cache alias, which bounds them with a
+TTL and is shared by every process (see ``CACHES`` in settings), so an invalidation made by a command reaches the web
+workers too. Any code path that writes graph data for a user must call ``mark_graph_changed`` so the next profile
+render picks up the change. It also records the time of the write on the profile, which profile pages use to answer
+conditional requests.
+"""
+import logging
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+
+from django.core.cache import caches
+from django.utils import timezone
+
+from volt.models import Profile
+
+logger = logging.getLogger(__name__)
+
+PROFILE_CACHE_ALIAS = "profiles"
+
+
+def _profile_context_key(graph_id: str) -> str:
+    return f"profile_context:{graph_id}"
+
+
+def get_or_build_profile_context(graph_id: str, build: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """Return the cached profile context for a user, building and storing it on a miss.
+
+    Args:
+        graph_id (str): The user identifier in AllegroGraph.
+        build (Callable): Callable that assembles the context from the graph and the database.
+
+    Returns:
+        Dict[str, Any]: The profile context.
+    """
+    cache = caches[PROFILE_CACHE_ALIAS]
+    key = _profile_context_key(graph_id)
+    context = cache.get(key)
+    if context is None:
+        logger.debug(f"Profile context cache miss for {graph_id}")
+        context = build()
+        cache.set(key, context)
+    return context
+
+
+async def aget_or_build_profile_context(
+    graph_id: str, build: Callable[[], Awaitable[Dict[str, Any]]]
+) -> Dict[str, Any]:
+    """Async version of ``get_or_build_profile_context``, taking a coroutine function as the builder."""
+    cache = caches[PROFILE_CACHE_ALIAS]
+    key = _profile_context_key(graph_id)
+    context = await cache.aget(key)
+    if context is None:
+        logger.debug(f"Profile context cache miss for {graph_id}")
+        context = await build()
+        await cache.aset(key, context)
+    return context
+
+
+def invalidate_profile_context(graph_id: str) -> None:
+    """Drop the cached profile context for a user after their graph or profile data changed."""
+    caches[PROFILE_CACHE_ALIAS].delete(_profile_context_key(str(graph_id)))
+
+
+def mark_graph_changed(graph_id: str) -> None:
+    """Record a write of a user's graph data and drop their cached profile context.
+
+    The time of the write is stored on the profile, so every process sees it and it survives cache evictions. It is
+    set with an UPDATE, which does not send ``post_save``, hence the explicit invalidation.
+    """
+    Profile.objects.filter(graph_id=graph_id).update(graph_updated_at=timezone.now())
+    invalidate_profile_context(graph_id)
+
+
+def mark_graphs_changed(graph_ids: Iterable[str]) -> None:
+    """Bulk version of ``mark_graph_changed``, with one UPDATE and one cache deletion for all the users."""
+    graph_ids = [str(graph_id) for graph_id in graph_ids]
+    if not graph_ids:
+        return
+    Profile.objects.filter(graph_id__in=graph_ids).update(graph_updated_at=timezone.now())
+    caches[PROFILE_CACHE_ALIAS].delete_many([_profile_context_key(graph_id) for graph_id in graph_ids])
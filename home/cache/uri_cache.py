@@ -0,0 +1,29 @@
+"""Memoized versions of the URI helpers of ``home.views.utils``.
+
+Profile renders convert the same small set of card and user URIs over and over, so the conversions are kept in
+bounded, thread-safe LRU memos. ``uri_cache_info`` exposes their hit and miss counters.
+"""
+from functools import lru_cache
+from typing import Any
+
+from django.conf import settings
+
+from home.views import utils
+
+encode_uri = lru_cache(maxsize=settings.URI_CACHE_MAX_ENTRIES)(utils.encode_uri)
+decode_uri = lru_cache(maxsize=settings.URI_CACHE_MAX_ENTRIES)(utils.decode_uri)
+get_label_from_uri = lru_cache(maxsize=settings.URI_CACHE_MAX_ENTRIES)(utils.get_label_from_uri)
+
+
+def uri_cache_info() -> dict[str, Any]:
+    return {
+        "encode_uri": encode_uri.cache_info(),
+        "decode_uri": decode_uri.cache_info(),
+        "get_label_from_uri": get_label_from_uri.cache_info(),
+    }
+
+
+def clear_uri_caches() -> None:
+    encode_uri.cache_clear()
+    decode_uri.cache_clear()
+    get_label_from_uri.cache_clear()
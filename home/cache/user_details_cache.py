@@ -0,0 +1,51 @@
+"""Cache of graph user details, keyed on the user label.
+
+Profiles list everyone who tagged them, so the same handful of users is resolved over and over. Details are looked up
+in bulk with a single cache round-trip and the misses are fetched from AllegroGraph with a single
+``get_users_details`` call.
+"""
+import logging
+from typing import Any
+from typing import Dict
+from typing import Iterable
+
+from django.core.cache import caches
+
+from home.cache.profile_cache import PROFILE_CACHE_ALIAS
+
+logger = logging.getLogger(__name__)
+
+
+def _user_details_key(label: str) -> str:
+    return f"user_details:{label}"
+
+
+def get_users_details(labels: Iterable[str], user_manager: Any) -> Dict[str, Any]:
+    """Resolve the graph details of several users at once.
+
+    Args:
+        labels (Iterable[str]): The user labels, as returned by ``get_label_from_uri``.
+        user_manager (UserManager): Manager used to fetch the users that are not cached yet, with one
+            ``get_users_details`` call.
+
+    Returns:
+        Dict[str, Any]: The user details, keyed on label.
+    """
+    cache = caches[PROFILE_CACHE_ALIAS]
+    keys = {_user_details_key(label): label for label in labels}
+    cached = cache.get_many(keys.keys())
+
+    details = {keys[key]: value for key, value in cached.items()}
+    missing = [label for key, label in keys.items() if key not in cached]
+    if missing:
+        logger.debug(f"Fetching details for {len(missing)} users from the graph")
+        fetched = user_manager.get_users_details(missing)
+        cache.set_many({_user_details_key(label): value for label, value in fetched.items()})
+        details.update(fetched)
+
+    return details
+
+
+def invalidate_user_details(label: str) -> None:
+    """Drop the cached graph details of a user after they changed."""
+    caches[PROFILE_CACHE_ALIAS].delete(_user_details_key(label))
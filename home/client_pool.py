@@ -0,0 +1,130 @@
+"""Thread-safe pool of long-lived graph clients.
+
+Each client owns its own connection to AllegroGraph, so checking a client out of the pool reuses an open, kept-alive
+connection instead of paying connection setup per query, and no two threads ever share a client.
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from queue import Empty
+from queue import LifoQueue
+from typing import Any
+from typing import Callable
+from typing import Iterator
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PoolStats:
+    size: int
+    created: int
+    in_use: int
+    idle: int
+    checkouts: int
+    total_wait_seconds: float
+    max_wait_seconds: float
+
+
+class ClientPool:
+    def __init__(self, factory: Callable[[], Any], size: int, timeout: Optional[float] = None, name: str = ""):
+        self.name = name
+        self._factory = factory
+        self._size = size
+        self._timeout = timeout
+        # LIFO so the most recently used client, whose connection is the most likely to still be alive, goes first
+        self._idle: LifoQueue = LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._in_use = 0
+        self._checkouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def prewarm(self) -> None:
+        """Open every client of the pool upfront so the first requests do not pay for it."""
+        while self._reserve_slot():
+            self._idle.put(self._create())
+        logger.info(f"Pre-warmed {self._size} clients in pool {self.name}")
+
+    @contextmanager
+    def client(self) -> Iterator[Any]:
+        """Check a client out of the pool for the duration of the block.
+
+        Raises:
+            queue.Empty: If no client became available within the pool timeout.
+        """
+        start = time.monotonic()
+        client = self._acquire()
+        wait = time.monotonic() - start
+        with self._lock:
+            self._in_use += 1
+            self._checkouts += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+
+        try:
+            yield client
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            self._idle.put(client)
+
+    def stats(self) -> PoolStats:
+        with self._lock:
+            return PoolStats(
+                size=self._size,
+                created=self._created,
+                in_use=self._in_use,
+                idle=self._idle.qsize(),
+                checkouts=self._checkouts,
+                total_wait_seconds=self._total_wait,
+                max_wait_seconds=self._max_wait,
+            )
+
+    def _acquire(self) -> Any:
+        try:
+            return self._idle.get_nowait()
+        except Empty:
+            pass
+
+        if self._reserve_slot():
+            return self._create()
+
+        try:
+            return self._idle.get(timeout=self._timeout)
+        except Empty:
+            logger.error(f"No client available in pool {self.name} after {self._timeout}s")
+            raise
+
+    def _reserve_slot(self) -> bool:
+        with self._lock:
+            if self._created >= self._size:
+                return False
+            self._created += 1
+            return True
+
+    def _create(self) -> Any:
+        try:
+            return self._factory()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+
+class PooledClient:
+    """Drop-in stand-in for a client that runs every method call on a client checked out of a pool."""
+
+    def __init__(self, pool: ClientPool):
+        self._pool = pool
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        def call(*args, **kwargs):
+            with self._pool.client() as client:
+                return getattr(client, name)(*args, **kwargs)
+
+        return call
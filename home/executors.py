@@ -0,0 +1,51 @@
+"""Bounded thread pool used to issue independent graph queries concurrently.
+
+Graph queries are I/O bound, so running them on a shared pool turns the latency of a view into the slowest query
+rather than the sum of all of them. Sync views under ``core.wsgi`` and ``core.asgi`` both block on the results, and
+the submitted callables must not touch the ORM.
+"""
+import logging
+import time
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+graph_query_executor = ThreadPoolExecutor(
+    max_workers=settings.GRAPH_QUERY_MAX_WORKERS,
+    thread_name_prefix="graph-query",
+)
+
+
+def run_concurrently(calls: Dict[str, Callable[[], Any]], timeout: Optional[float] = None) -> Dict[str, Any]:
+    """Run several independent calls on the graph query pool and wait for all of them.
+
+    Args:
+        calls (Dict[str, Callable]): The calls to run, keyed on the name their result is returned under.
+        timeout (float): Seconds each call may take, counted from submission. Defaults to ``GRAPH_QUERY_TIMEOUT``.
+
+    Returns:
+        Dict[str, Any]: The result of each call, keyed like ``calls``.
+
+    Raises:
+        TimeoutError: If any call did not finish in time. Calls that have not started yet are cancelled.
+    """
+    if timeout is None:
+        timeout = settings.GRAPH_QUERY_TIMEOUT
+
+    deadline = time.monotonic() + timeout
+    futures: Dict[str, Future] = {name: graph_query_executor.submit(call) for name, call in calls.items()}
+    try:
+        return {name: future.result(timeout=max(0.0, deadline - time.monotonic())) for name, future in futures.items()}
+    except TimeoutError:
+        logger.error(f"Graph queries did not finish within {timeout}s: {[n for n, f in futures.items() if not f.done()]}")
+        for future in futures.values():
+            future.cancel()
+        raise
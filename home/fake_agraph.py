@@ -0,0 +1,187 @@
+"""In-process stand-in for AllegroGraph, for local benchmarks and tests.
+
+``FakeUserManager`` and ``FakeAgraphManager`` implement the subset of the ``UserManager``/``AgraphManager`` interface
+the views use, on top of a thread-safe in-memory store shared by every manager of the process. Select them with the
+``AGRAPH_USER_MANAGER``/``AGRAPH_MANAGER`` settings, and set ``AGRAPH_FAKE_LATENCY`` to simulate the round-trip time of
+a real graph. Card writes go through ``home.graph_writes.record_card_write`` like real ones should. The store can be
+saved to and loaded from a JSON file (``AGRAPH_FAKE_DATA``) so it can be seeded by one process and served by others.
+"""
+import copy
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict
+from dataclasses import dataclass
+from dataclasses import field
+from types import SimpleNamespace
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from django.conf import settings
+
+from home.graph_writes import record_card_write
+
+logger = logging.getLogger(__name__)
+
+USER_URI_PREFIX = "http://fake.graph/user/"
+CARD_URI_PREFIX = "http://fake.graph/card/"
+
+
+@dataclass
+class FakeCard:
+    id: str
+    label: str
+    type: str
+    created_by: str
+    is_public: str = "yes"
+    is_stub: str = "no"
+    tagged_users: List[str] = field(default_factory=list)
+
+    @property
+    def card_type(self) -> str:
+        return self.type
+
+
+class InMemoryGraph:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.users: Dict[str, Any] = {}
+        self.cards: Dict[str, FakeCard] = {}
+
+    def add_user(self, user: Any) -> None:
+        with self._lock:
+            self.users[str(user.user_id)] = user
+
+    def add_users(self, users: List[Any]) -> None:
+        with self._lock:
+            self.users.update((str(user.user_id), user) for user in users)
+
+    def add_card(self, card: FakeCard) -> None:
+        with self._lock:
+            self.cards[card.id] = card
+
+    def get_user(self, label: str) -> Optional[Any]:
+        with self._lock:
+            return self.users.get(label)
+
+    def remove_card(self, card_id: str) -> Optional[FakeCard]:
+        with self._lock:
+            return self.cards.pop(card_id, None)
+
+    def get_users(self, labels: List[str]) -> Dict[str, Optional[Any]]:
+        with self._lock:
+            return {label: self.users.get(label) for label in labels}
+
+    def get_card(self, card_id: str) -> Optional[FakeCard]:
+        with self._lock:
+            card = self.cards.get(card_id)
+            # Callers mutate the cards they get (e.g. to encode their ids), so never hand out the stored ones
+            return copy.copy(card) if card else None
+
+    def find_cards(self, created_by: Optional[str] = None, tagged_user: Optional[str] = None) -> List[FakeCard]:
+        with self._lock:
+            return [
+                copy.copy(card)
+                for card in self.cards.values()
+                if (created_by is None or card.created_by == f"{USER_URI_PREFIX}{created_by}") and (
+                    tagged_user is None or tagged_user in card.tagged_users
+                )
+            ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.users.clear()
+            self.cards.clear()
+
+    def dump(self, path: str) -> None:
+        with self._lock:
+            data = {
+                "users": [user.model_dump() if hasattr(user, "model_dump") else vars(user) for user in self.users.values()],
+                "cards": [asdict(card) for card in self.cards.values()],
+            }
+        with open(path, "w") as f:
+            json.dump(data, f)
+
+    def load(self, path: str, missing_ok: bool = False) -> None:
+        if missing_ok and not os.path.exists(path):
+            logger.info(f"No fake graph data at {path} yet, starting with an empty graph")
+            return
+        with open(path, "r") as f:
+            data = json.load(f)
+        for user in data["users"]:
+            self.add_user(SimpleNamespace(**user))
+        for card in data["cards"]:
+            self.add_card(FakeCard(**card))
+        logger.info(f"Loaded {len(data['users'])} users and {len(data['cards'])} cards into the fake graph")
+
+
+graph = InMemoryGraph()
+if settings.AGRAPH_FAKE_DATA:
+    # The file does not exist before the first seed_load_data run, which imports this module to create it
+    graph.load(settings.AGRAPH_FAKE_DATA, missing_ok=True)
+
+
+def _simulate_latency() -> None:
+    if settings.AGRAPH_FAKE_LATENCY:
+        time.sleep(settings.AGRAPH_FAKE_LATENCY)
+
+
+class FakeUserManager:
+    def create_user(self, user: Any) -> None:
+        _simulate_latency()
+        graph.add_user(user)
+
+    def create_users(self, users: List[Any]) -> None:
+        """Create several users in one round trip, as a single INSERT DATA would."""
+        _simulate_latency()
+        graph.add_users(users)
+
+    def get_user_details(self, label: str) -> Optional[Any]:
+        _simulate_latency()
+        return graph.get_user(label)
+
+    def get_users_details(self, labels: List[str]) -> Dict[str, Optional[Any]]:
+        """Return the details of several users, keyed on label, in one round trip."""
+        _simulate_latency()
+        return graph.get_users(labels)
+
+    def get_user_contributions(self, user_id: str) -> List[FakeCard]:
+        """Return the cards the user was tagged in."""
+        _simulate_latency()
+        return graph.find_cards(tagged_user=user_id)
+
+    def get_user_creations(self, user_id: str) -> List[FakeCard]:
+        _simulate_latency()
+        return graph.find_cards(created_by=user_id)
+
+    def get_user_activities(self, user_id: str) -> List[FakeCard]:
+        """Return the cards the user created or was tagged in."""
+        _simulate_latency()
+        created = graph.find_cards(created_by=user_id)
+        created_ids = {card.id for card in created}
+        return created + [card for card in graph.find_cards(tagged_user=user_id) if card.id not in created_ids]
+
+
+class FakeAgraphManager:
+    def get_card_details(self, card_id: str) -> Optional[FakeCard]:
+        _simulate_latency()
+        return graph.get_card(card_id)
+
+    def create_card(self, card: FakeCard) -> None:
+        _simulate_latency()
+        graph.add_card(card)
+        _record_card_write(card, delta=1)
+
+    def delete_card(self, card_id: str) -> None:
+        _simulate_latency()
+        card = graph.remove_card(card_id)
+        if card is not None:
+            _record_card_write(card, delta=-1)
+
+
+def _record_card_write(card: FakeCard, delta: int) -> None:
+    record_card_write(card, card.created_by[len(USER_URI_PREFIX):], delta, card.tagged_users)
@@ -0,0 +1,32 @@
+"""Bookkeeping that goes with every card written to the graph.
+
+Graph managers call ``record_card_write`` once a card was created, edited or deleted, so the data the database and the
+caches keep about the graph follows it. ``home.fake_agraph`` calls it from its card writes. The AllegroGraph managers
+of ``home.agraph`` do not call it yet: until they are wired to it, writes to the real graph leave the contribution
+counts as they are, only ``backfill_contribution_counts`` fills them, and a cached card fragment is only refreshed once
+its TTL expires or ``CARD_TEMPLATE_VERSION`` is bumped.
+"""
+from typing import Any
+from typing import Iterable
+
+from home.cache.card_cache import invalidate_card_fragment
+from home.cache.profile_cache import mark_graphs_changed
+from volt.models import Profile
+
+
+def record_card_write(card: Any, creator_graph_id: str, delta: int = 0, tagged_graph_ids: Iterable[str] = ()) -> None:
+    """Record a card write in the database and drop the cached fragment of the card.
+
+    Args:
+        card (Any): The written card, with its ``id``, ``type``, ``is_public`` and ``is_stub`` attributes.
+        creator_graph_id (str): The identifier in AllegroGraph of the user who created the card.
+        delta (int): 1 when the card was created, -1 when it was deleted and 0 when it was edited.
+        tagged_graph_ids (Iterable[str]): The identifiers of the users tagged in the card, whose profiles list it too.
+    """
+    # Only public, non-stub cards are counted, see count_contributions
+    if delta and card.is_public == "yes" and card.is_stub != "yes":
+        profile = Profile.objects.filter(graph_id=creator_graph_id).first()
+        if profile is not None:
+            profile.record_contribution(card.type, delta)
+    mark_graphs_changed([creator_graph_id, *tagged_graph_ids])
+    invalidate_card_fragment(card.id)
@@ -0,0 +1,72 @@
+"""Readers that yield the records of large JSON exports one at a time.
+
+``json.load`` holds the whole document in memory. These readers keep at most one buffer and one record in memory, so
+exports of any size can be ingested: JSON Lines files (``.jsonl``/``.ndjson``) are read line by line, and JSON arrays
+are decoded incrementally with ``json.JSONDecoder.raw_decode``.
+"""
+import json
+from typing import Any
+from typing import Iterator
+from typing import TextIO
+
+JSON_LINES_EXTENSIONS = (".jsonl", ".ndjson")
+
+
+def iter_json_records(path: str) -> Iterator[Any]:
+    """Yield the records of a JSON Lines file or of a file holding a JSON array."""
+    with open(path, "r") as f:
+        if path.endswith(JSON_LINES_EXTENSIONS):
+            yield from iter_json_lines(f)
+        else:
+            yield from iter_json_array(f)
+
+
+def iter_json_lines(f: TextIO) -> Iterator[Any]:
+    for line_number, line in enumerate(f, start=1):
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON on line {line_number}: {e}") from e
+
+
+def iter_json_array(f: TextIO, buffer_size: int = 64 * 1024) -> Iterator[Any]:
+    """Yield the elements of the top-level JSON array of a file without loading the whole array."""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+    started = False
+
+    while True:
+        # Skip the separators between elements
+        while pos < len(buffer) and (buffer[pos].isspace() or (started and buffer[pos] == ",")):
+            pos += 1
+
+        if pos < len(buffer):
+            if not started:
+                if buffer[pos] != "[":
+                    raise ValueError("Expected a JSON array")
+                started = True
+                pos += 1
+                continue
+            if buffer[pos] == "]":
+                return
+            try:
+                record, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                # A value that ends the buffer may be cut short (e.g. a number), so only trust it at the end of file
+                if end < len(buffer) or eof:
+                    yield record
+                    pos = end
+                    continue
+        elif eof:
+            raise ValueError("Unexpected end of file in JSON array")
+
+        chunk = f.read(buffer_size)
+        eof = not chunk
+        buffer = buffer[pos:] + chunk
+        pos = 0
@@ -0,0 +1,54 @@
+import logging
+from collections import Counter
+from concurrent.futures import TimeoutError
+from functools import partial
+
+from django.core.management.base import BaseCommand
+
+from home.agraph_clients import user_manager
+from home.executors import run_concurrently
+from volt.models import Profile
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Materialize the contribution counts of the profiles that do not have them yet, from their graph cards"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=50, help="Profiles whose cards are fetched at once")
+
+    def handle(self, *args, **options):
+        filled = skipped = last_pk = 0
+        while True:
+            profiles = list(
+                Profile.objects.filter(contribution_counts__isnull=True, pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", "graph_id")[:options["batch_size"]]
+            )
+            if not profiles:
+                break
+            last_pk = profiles[-1][0]
+
+            try:
+                creations = run_concurrently({
+                    pk: partial(user_manager.get_user_creations, str(graph_id)) for pk, graph_id in profiles
+                })
+            except (TimeoutError, ConnectionError) as e:
+                logger.error(f"Could not fetch the cards of profiles {profiles[0][0]} to {last_pk}: {e}")
+                skipped += len(profiles)
+                continue
+
+            for pk, cards in creations.items():
+                # Only fill profiles that are still missing their counts, record_contribution leaves those untouched.
+                # A card created between the graph read above and this update is not counted.
+                filled += Profile.objects.filter(pk=pk, contribution_counts__isnull=True).update(
+                    contribution_counts=count_contributions(cards)
+                )
+
+        self.stdout.write(self.style.SUCCESS(f"Filled the contribution counts of {filled} profiles, {skipped} skipped"))
+
+
+def count_contributions(cards) -> dict:
+    """Count the public, non-stub cards by type, like the created cards section of the profile page."""
+    return dict(Counter(card.type for card in cards if card.is_public == "yes" and card.is_stub != "yes"))
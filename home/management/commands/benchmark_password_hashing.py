@@ -0,0 +1,42 @@
+import os
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+
+from home.password_hashing import get_hashing_pool
+from home.password_hashing import hash_passwords
+
+
+class Command(BaseCommand):
+    help = "Measure how many user passwords per second are hashed serially and across process pools"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=200, help="Number of passwords to hash per run")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            nargs="+",
+            default=None,
+            help="Pool sizes to measure. Defaults to powers of two up to the number of cores",
+        )
+
+    def handle(self, *args, **options):
+        passwords = [f"password-{i}" for i in range(options["users"])]
+        cores = os.cpu_count() or 1
+        workers = options["workers"] or [2 ** i for i in range(cores.bit_length()) if 2 ** i <= cores]
+
+        start = time.perf_counter()
+        for password in passwords:
+            make_password(password)
+        serial = len(passwords) / (time.perf_counter() - start)
+        self.stdout.write(f"serial: {serial:,.1f} users/s")
+
+        for max_workers in workers:
+            with get_hashing_pool(max_workers) as pool:
+                # Start the workers before timing, the pool is reused across batches by the callers
+                hash_passwords(["warm-up"] * max_workers, pool, chunksize=1)
+                start = time.perf_counter()
+                hash_passwords(passwords, pool)
+                parallel = len(passwords) / (time.perf_counter() - start)
+            self.stdout.write(f"{max_workers} workers: {parallel:,.1f} users/s ({parallel / serial:.2f}x)")
@@ -0,0 +1,45 @@
+import random
+import timeit
+import uuid
+
+from django.core.management.base import BaseCommand
+
+from home.cache import uri_cache
+from home.views import utils
+
+
+class Command(BaseCommand):
+    help = "Measure the throughput of the URI helpers with and without their LRU memos"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--uris", type=int, default=500, help="Number of distinct URIs")
+        parser.add_argument("--calls", type=int, default=100_000, help="Number of calls per helper")
+
+    def handle(self, *args, **options):
+        # Profile renders go over a small universe of card and user URIs many times, so sample with repetition
+        universe = [
+            f"http://helioweb.org/{random.choice(['card', 'user'])}/{uuid.uuid4()}" for _ in range(options["uris"])
+        ]
+        uris = random.choices(universe, k=options["calls"])
+        encoded = [utils.encode_uri(uri) for uri in uris]
+
+        uri_cache.clear_uri_caches()
+        for name, raw, memoized, inputs in (
+            ("encode_uri", utils.encode_uri, uri_cache.encode_uri, uris),
+            ("decode_uri", utils.decode_uri, uri_cache.decode_uri, encoded),
+            ("get_label_from_uri", utils.get_label_from_uri, uri_cache.get_label_from_uri, uris),
+        ):
+            raw_ops = self._ops_per_second(raw, inputs)
+            memoized_ops = self._ops_per_second(memoized, inputs)
+            self.stdout.write(
+                f"{name}: {raw_ops:,.0f} ops/s raw, {memoized_ops:,.0f} ops/s memoized "
+                f"({memoized_ops / raw_ops:.2f}x)"
+            )
+
+        for name, info in uri_cache.uri_cache_info().items():
+            self.stdout.write(f"{name}: {info.hits} hits, {info.misses} misses")
+
+    @staticmethod
+    def _ops_per_second(func, inputs) -> float:
+        elapsed = timeit.timeit(lambda: [func(i) for i in inputs], number=1)
+        return len(inputs) / elapsed
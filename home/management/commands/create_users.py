@@ -1,46 +1,92 @@
+import itertools
 import json
 import os
+from contextlib import nullcontext
 
 from django.contrib.auth.models import User
+from django.core.management import call_command
 from django.core.management.base import BaseCommand
+from django.db import transaction
 
 from home.agraph.agraph_models import GraphUser
-from home.agraph.user_manager import UserManager
+from home.json_stream import iter_json_records
+from home.password_hashing import get_hashing_pool
+from home.password_hashing import hash_passwords
+from volt.models import GraphUserOutbox
+from volt.models import Profile
 
 
 class Command(BaseCommand):
     help = "Create a superuser with a predefined password if it does not exist"
     users_file = os.path.join(os.path.dirname(__file__), "../../fixtures/users.json")
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--file",
+            default=self.users_file,
+            help="Users to create, as a JSON array or as JSON Lines (.jsonl). Read as a stream, so it can be large",
+        )
+        parser.add_argument(
+            "--bulk",
+            action="store_true",
+            help="Insert users and profiles in bulk and hash passwords in parallel, to provision many users quickly",
+        )
+        parser.add_argument("--chunk-size", type=int, default=1000, help="Users committed at once")
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Skip the users committed by a previous, interrupted run of the same file",
+        )
+
     def handle(self, *args, **options):
-        self.create_users()
+        checkpoint = Checkpoint(f"{options['file']}.checkpoint")
+        processed = checkpoint.load() if options["resume"] else 0
+        if processed:
+            self.stdout.write(f"Resuming after {processed} users")
+
+        users = itertools.islice(iter_json_records(options["file"]), processed, None)
+        chunks = iter(lambda: list(itertools.islice(users, options["chunk_size"])), [])
+        create_chunk = self.bulk_create_users if options["bulk"] else self.create_users
+
+        # Graph users are queued in the graph outbox, in the transaction that creates their Django user, and created
+        # by drain_graph_outbox once the chunk is committed. Entries left pending by an interrupted run, or by a graph
+        # failure, are drained first
+        self.drain_graph_outbox()
+        # Passwords are only hashed in parallel in bulk mode, the one-by-one mode hashes them in create_user
+        with get_hashing_pool() if options["bulk"] else nullcontext() as hashing_pool:
+            self.hashing_pool = hashing_pool
+            for chunk in chunks:
+                create_chunk(chunk)
+                processed += len(chunk)
+                checkpoint.save(processed)
+                self.drain_graph_outbox()
 
-    def create_users(self):
-        with open(self.users_file, "r") as f:
-            users = json.load(f)
+        checkpoint.clear()
 
-        um = UserManager()
+    def drain_graph_outbox(self):
+        call_command("drain_graph_outbox", stdout=self.stdout)
+
+    def create_users(self, users):
         for user in users:
             if not User.objects.filter(username=user["email"]).exists():
                 django_user: User
-                if user["is_superuser"]:
-                    django_user = User.objects.create_superuser(
-                        username=user["email"], email=user["email"], password=user["password"]
-                    )
-                else:
-                    django_user = User.objects.create_user(
-                        username=user["email"], email=user["email"], password=user["password"]
-                    )
-                if user.get("user_info"):
-                    django_user.profile.user_info = user["user_info"]
-                    django_user.profile.save()
-                if user.get("pretty_printed"):
-                    django_user.profile.pretty_printed_user_info = user["pretty_printed"]
-                    django_user.profile.save()
-
-                user["user_id"] = str(django_user.profile.graph_id)
-                user["django_id"] = str(django_user.id)
-                um.create_user(GraphUser.from_dict(user))  # type: ignore
+                with transaction.atomic():
+                    if user["is_superuser"]:
+                        django_user = User.objects.create_superuser(
+                            username=user["email"], email=user["email"], password=user["password"]
+                        )
+                    else:
+                        django_user = User.objects.create_user(
+                            username=user["email"], email=user["email"], password=user["password"]
+                        )
+                    if user.get("user_info"):
+                        django_user.profile.user_info = user["user_info"]
+                        django_user.profile.save()
+                    if user.get("pretty_printed"):
+                        django_user.profile.pretty_printed_user_info = user["pretty_printed"]
+                        django_user.profile.save()
+
+                    GraphUserOutbox.objects.create(payload=_graph_user_payload(user, django_user, django_user.profile))
                 self.stdout.write(
                     self.style.SUCCESS(
                         f"Successfully created user {user['email']}"
@@ -50,3 +96,77 @@ class Command(BaseCommand):
                 self.stdout.write(
                     self.style.WARNING(f"User {user['email']} already exists")
                 )
+
+    def bulk_create_users(self, users):
+        """Create a chunk of users with a few queries instead of several per user.
+
+        Existing usernames are fetched in a single query, passwords are hashed on every core, and users, profiles
+        and graph outbox entries are inserted with ``bulk_create``. ``bulk_create`` does not send ``post_save``, so
+        profiles are created here rather than by ``update_user_profile``.
+        """
+        existing = set(User.objects.filter(username__in=[u["email"] for u in users]).values_list("username", flat=True))
+        new_users = []
+        for user in users:
+            if user["email"] in existing:
+                self.stdout.write(self.style.WARNING(f"User {user['email']} already exists"))
+            else:
+                # Also skips later duplicates of the same email, like the one-by-one mode does
+                existing.add(user["email"])
+                new_users.append(user)
+        passwords = hash_passwords([u["password"] for u in new_users], self.hashing_pool)
+
+        with transaction.atomic():
+            django_users = User.objects.bulk_create([
+                User(
+                    username=user["email"],
+                    email=user["email"],
+                    password=password,
+                    is_staff=user["is_superuser"],
+                    is_superuser=user["is_superuser"],
+                )
+                for user, password in zip(new_users, passwords)
+            ])
+            profiles = Profile.objects.bulk_create([
+                Profile(
+                    user=django_user,
+                    user_info=user.get("user_info") or None,
+                    pretty_printed_user_info=user.get("pretty_printed") or None,
+                )
+                for user, django_user in zip(new_users, django_users)
+            ])
+            GraphUserOutbox.objects.bulk_create([
+                GraphUserOutbox(payload=_graph_user_payload(user, django_user, profile))
+                for user, django_user, profile in zip(new_users, django_users, profiles)
+            ])
+
+        self.stdout.write(self.style.SUCCESS(f"Successfully created {len(new_users)} users"))
+
+
+def _graph_user_payload(user: dict, django_user: User, profile: Profile) -> dict:
+    user["user_id"] = str(profile.graph_id)
+    user["django_id"] = str(django_user.id)
+    return GraphUser.from_dict(user).model_dump(mode="json", exclude_unset=True)  # type: ignore
+
+
+class Checkpoint:
+    """Number of users of a file that have been committed, saved next to the file so a run can be resumed."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> int:
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)["processed"]
+        except FileNotFoundError:
+            return 0
+
+    def save(self, processed: int) -> None:
+        # Write then rename, so an interruption never leaves a truncated checkpoint behind
+        with open(f"{self.path}.tmp", "w") as f:
+            json.dump({"processed": processed}, f)
+        os.replace(f"{self.path}.tmp", self.path)
+
+    def clear(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
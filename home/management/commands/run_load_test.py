@@ -0,0 +1,194 @@
+import json
+import queue
+import random
+import re
+import statistics
+import subprocess
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from datetime import timezone
+from http.cookiejar import CookieJar
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.urls import reverse
+
+CSRF_TOKEN_RE = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+
+
+class Command(BaseCommand):
+    help = (
+        "Run a login, profile view, card fetch and registration scenario against a running server, "
+        "and report p50/p95/p99 latency and throughput of each step"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://localhost:8000", help="Server under test")
+        parser.add_argument("--manifest", default="loadtest_manifest.json", help="Written by seed_load_data")
+        parser.add_argument("--concurrency", type=int, default=10, help="Number of simulated users")
+        parser.add_argument("--iterations", type=int, default=20, help="Scenario iterations per simulated user")
+        parser.add_argument("--async-views", action="store_true", help="Hit the async profile and card views")
+        parser.add_argument("--output", default="loadtest_results.json", help="Where to write the results")
+        parser.add_argument("--timeout", type=float, default=30.0, help="Timeout of each request, in seconds")
+
+    def handle(self, *args, **options):
+        with open(options["manifest"], "r") as f:
+            manifest = json.load(f)
+        if not manifest["users"] or not manifest["cards"]:
+            raise CommandError("The manifest has no users or cards, run seed_load_data first")
+
+        invite_codes: queue.Queue[str] = queue.Queue()
+        for code in manifest["invite_codes"]:
+            invite_codes.put(code)
+        scenario = Scenario(
+            base_url=options["base_url"].rstrip("/"),
+            manifest=manifest,
+            invite_codes=invite_codes,
+            async_views=options["async_views"],
+            timeout=options["timeout"],
+        )
+
+        started_at = datetime.now(timezone.utc)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as executor:
+            futures = [executor.submit(scenario.run, options["iterations"]) for _ in range(options["concurrency"])]
+            for future in futures:
+                future.result()
+        elapsed = time.perf_counter() - start
+
+        results = {
+            "commit": _get_git_commit(),
+            "started_at": started_at.isoformat(),
+            "base_url": options["base_url"],
+            "async_views": options["async_views"],
+            "concurrency": options["concurrency"],
+            "iterations": options["iterations"],
+            "elapsed_seconds": elapsed,
+            "steps": {step: _summarize(samples, elapsed) for step, samples in scenario.samples.items()},
+            "total": _summarize([s for samples in scenario.samples.values() for s in samples], elapsed),
+        }
+        with open(options["output"], "w") as f:
+            json.dump(results, f, indent=2)
+
+        for step, summary in {**results["steps"], "total": results["total"]}.items():
+            self.stdout.write(
+                f"{step:<14} {summary['requests']:>6} req  {summary['errors']:>4} err  "
+                f"p50 {summary['p50_ms']:>8.1f} ms  p95 {summary['p95_ms']:>8.1f} ms  "
+                f"p99 {summary['p99_ms']:>8.1f} ms  {summary['throughput_rps']:>8.1f} req/s"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+
+
+class Scenario:
+    """Scripted session of a user: log in, then view profiles, fetch cards and register new users."""
+
+    def __init__(self, base_url, manifest, invite_codes, async_views, timeout):
+        self.base_url = base_url
+        self.manifest = manifest
+        self.invite_codes = invite_codes
+        self.timeout = timeout
+        self.profile_url = "profile_async" if async_views else "profile"
+        self.card_url = "fetch_card_data_for_user_async" if async_views else "fetch_card_data_for_user"
+        # (elapsed seconds, succeeded) of every request, by step
+        self.samples = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def run(self, iterations: int) -> None:
+        rng = random.Random()
+        opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(CookieJar()))
+        user = rng.choice(self.manifest["users"])
+        self._login(opener, user["email"], self.manifest["password"])
+
+        for _ in range(iterations):
+            viewed = rng.choice(self.manifest["users"])
+            self._request("profile", opener, self.profile_path(viewed["django_id"]))
+            self._request("card", opener, self.card_path(viewed["django_id"], rng.choice(self.manifest["cards"])))
+            self._register(rng)
+
+    def profile_path(self, user_id) -> str:
+        return reverse(self.profile_url, kwargs={"user_id": user_id})
+
+    def card_path(self, user_id, card_id: str) -> str:
+        return reverse(self.card_url, kwargs={"user_id": user_id, "card_id": card_id})
+
+    def _login(self, opener, email: str, password: str) -> None:
+        login_url = reverse("login")
+        page = self._request("login_form", opener, login_url)
+        self._request("login", opener, login_url, {
+            "csrfmiddlewaretoken": _get_csrf_token(page),
+            "username": email,
+            "password": password,
+        })
+
+    def _register(self, rng) -> None:
+        try:
+            invite_code = self.invite_codes.get_nowait()
+        except queue.Empty:
+            return
+        # Registration logs nobody in, so use a fresh session instead of the scenario's
+        opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(CookieJar()))
+        register_url = reverse("register")
+        page = self._request("register_form", opener, register_url)
+        password = f"Load-{rng.getrandbits(64):x}"
+        self._request("register", opener, register_url, {
+            "csrfmiddlewaretoken": _get_csrf_token(page),
+            "email": f"loadtest-register-{rng.getrandbits(64):x}@example.com",
+            "password1": password,
+            "password2": password,
+            "invite_code": invite_code,
+        })
+
+    def _request(self, step: str, opener, path: str, data=None) -> str:
+        url = f"{self.base_url}{path}"
+        body = urllib.parse.urlencode(data).encode() if data is not None else None
+        request = urllib.request.Request(url, data=body, headers={"Referer": url})
+        start = time.perf_counter()
+        try:
+            with opener.open(request, timeout=self.timeout) as response:
+                content = response.read().decode()
+            succeeded = True
+        except (urllib.error.URLError, TimeoutError):
+            content = ""
+            succeeded = False
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.samples[step].append((elapsed, succeeded))
+        return content
+
+
+def _get_csrf_token(page: str) -> str:
+    match = CSRF_TOKEN_RE.search(page)
+    return match.group(1) if match else ""
+
+
+def _summarize(samples, elapsed: float) -> dict:
+    latencies = sorted(latency for latency, _ in samples)
+    if len(latencies) > 1:
+        percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+        p50, p95, p99 = percentiles[49], percentiles[94], percentiles[98]
+    else:
+        p50 = p95 = p99 = latencies[0] if latencies else 0.0
+    return {
+        "requests": len(samples),
+        "errors": sum(1 for _, succeeded in samples if not succeeded),
+        "mean_ms": statistics.fmean(latencies) * 1000 if latencies else 0.0,
+        "p50_ms": p50 * 1000,
+        "p95_ms": p95 * 1000,
+        "p99_ms": p99 * 1000,
+        "throughput_rps": len(samples) / elapsed if elapsed else 0.0,
+    }
+
+
+def _get_git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
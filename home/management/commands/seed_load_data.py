@@ -0,0 +1,152 @@
+import json
+import os
+import random
+import uuid
+from collections import defaultdict
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+from home.cache.uri_cache import encode_uri
+from home.constants import profile_constants as constants
+from home.fake_agraph import CARD_URI_PREFIX
+from home.fake_agraph import FakeCard
+from home.fake_agraph import FakeUserManager
+from home.fake_agraph import graph
+from home.fake_agraph import USER_URI_PREFIX
+from home.management.commands.backfill_contribution_counts import count_contributions
+from volt.models import InviteCode
+from volt.models import Profile
+
+LOAD_TEST_USER_PREFIX = "loadtest-"
+CARD_TYPES = ["Study", "Method", "Topic", "Mission", "Instrument", "Dataset", "Event"]
+
+
+class Command(BaseCommand):
+    help = "Generate synthetic users, profiles, graph cards and invite codes for load testing"
+    users_file = os.path.join(os.path.dirname(__file__), "../../fixtures/users.json")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100, help="Number of users to create")
+        parser.add_argument("--cards", type=int, default=1000, help="Number of graph cards to create")
+        parser.add_argument("--invite-codes", type=int, default=100, help="Invite codes for the registration step")
+        parser.add_argument("--password", default="loadtest-password", help="Password of every synthetic user")
+        parser.add_argument("--manifest", default="loadtest_manifest.json", help="Where to write the seeded data")
+        parser.add_argument("--seed", type=int, default=None, help="Random seed, for reproducible data sets")
+
+    def handle(self, *args, **options):
+        # Synthetic users must never end up in a real AllegroGraph
+        if not issubclass(FakeUserManager, import_string(settings.AGRAPH_USER_MANAGER)):
+            raise CommandError("Load data can only be seeded with the in-memory graph backend (home.fake_agraph)")
+        if not settings.AGRAPH_FAKE_DATA:
+            raise CommandError("Set AGRAPH_FAKE_DATA so the servers under test load the seeded graph")
+
+        rng = random.Random(options["seed"])
+        with open(self.users_file, "r") as f:
+            user_info_samples = [u["user_info"] for u in json.load(f) if u.get("user_info")]
+
+        users = self._create_users(options["users"], options["password"], user_info_samples, rng)
+        cards = self._create_cards(options["cards"], users, rng)
+        self._fill_contribution_counts(users, cards)
+        invite_codes = self._create_invite_codes(options["invite_codes"])
+        graph.dump(settings.AGRAPH_FAKE_DATA)
+
+        with open(options["manifest"], "w") as f:
+            json.dump({
+                "password": options["password"],
+                "users": [{"email": u.email, "django_id": u.id} for u in users],
+                # Card ids are encoded the way they appear in card URLs
+                "cards": [encode_uri(card.id) for card in cards],
+                "invite_codes": invite_codes,
+            }, f)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded {len(users)} users, {len(cards)} cards and {len(invite_codes)} invite codes "
+                f"into {settings.AGRAPH_FAKE_DATA} and {options['manifest']}"
+            )
+        )
+
+    def _create_users(self, num_users, password, user_info_samples, rng):
+        # Every synthetic user shares the password, so it is only hashed once
+        password_hash = make_password(password)
+        batch = uuid.uuid4().hex[:8]
+        with transaction.atomic():
+            users = User.objects.bulk_create([
+                User(
+                    username=f"{LOAD_TEST_USER_PREFIX}{batch}-{i}@example.com",
+                    email=f"{LOAD_TEST_USER_PREFIX}{batch}-{i}@example.com",
+                    password=password_hash,
+                )
+                for i in range(num_users)
+            ])
+            # bulk_create skips the post_save signal that creates profiles
+            profiles = Profile.objects.bulk_create([
+                Profile(
+                    user=user,
+                    user_info=rng.choice(user_info_samples) if user_info_samples else None,
+                    pretty_printed_user_info=_pretty_printed_user_info(i, rng),
+                )
+                for i, user in enumerate(users)
+            ])
+
+        for user, profile in zip(users, profiles):
+            graph.add_user(SimpleNamespace(user_id=str(profile.graph_id), django_id=str(user.id), email=user.email))
+            user.graph_id = str(profile.graph_id)
+        return users
+
+    def _create_cards(self, num_cards, users, rng):
+        cards = []
+        for i in range(num_cards):
+            creator = rng.choice(users)
+            tagged = rng.sample(users, k=min(len(users), rng.randint(0, 3)))
+            card = FakeCard(
+                id=f"{CARD_URI_PREFIX}{uuid.uuid4()}",
+                label=f"Synthetic card {i}",
+                type=rng.choice(CARD_TYPES),
+                created_by=f"{USER_URI_PREFIX}{creator.graph_id}",
+                is_public="yes" if rng.random() < 0.9 else "no",
+                is_stub="yes" if rng.random() < 0.05 else "no",
+                tagged_users=[u.graph_id for u in tagged if u is not creator],
+            )
+            graph.add_card(card)
+            cards.append(card)
+        return cards
+
+    def _fill_contribution_counts(self, users, cards):
+        # The cards are written straight to the store rather than through FakeAgraphManager.create_card, which would
+        # record them one by one, so the counts of the new profiles are materialized at once
+        cards_by_creator = defaultdict(list)
+        for card in cards:
+            cards_by_creator[card.created_by[len(USER_URI_PREFIX):]].append(card)
+        profiles = list(Profile.objects.filter(graph_id__in=[user.graph_id for user in users]))
+        for profile in profiles:
+            profile.contribution_counts = count_contributions(cards_by_creator[str(profile.graph_id)])
+        Profile.objects.bulk_update(profiles, ["contribution_counts"], batch_size=1000)
+
+    def _create_invite_codes(self, num_codes):
+        admin = User.objects.filter(is_superuser=True).first()
+        if admin is None:
+            raise CommandError("Create a superuser first, invite codes need a creator")
+
+        codes = [InviteCode(created_by=admin, source_event="loadtest") for _ in range(num_codes)]
+        for code in codes:
+            code.save()
+        return [code.code for code in codes]
+
+
+def _pretty_printed_user_info(i, rng):
+    return {
+        constants.PF_NAME: f"Synthetic User {i}",
+        constants.PF_JOB_TITLE: rng.choice(["Research Scientist", "Engineer", "Postdoc", "Program Scientist"]),
+        constants.PF_EMPLOYER: rng.choice(["NASA GSFC", "JPL", "UC Berkeley", "APL"]),
+        constants.PF_CAREER_STAGE: rng.choice(["Early career", "Mid career", "Senior"]),
+        constants.PF_TOPICS: rng.sample(["Solar wind", "Magnetosphere", "Ionosphere", "Heliosphere", "Flares"], k=2),
+        constants.PF_METHODS: rng.sample(["Modeling", "Observation", "Machine learning", "Instrumentation"], k=2),
+    }
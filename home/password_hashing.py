@@ -0,0 +1,48 @@
+"""Parallel password hashing for bulk user creation and imports.
+
+The password hashers are deliberately slow (PBKDF2 runs hundreds of thousands of iterations), so hashing dominates the
+cost of creating users in bulk. Hashing is CPU bound and holds the GIL, so batches are spread over a process pool and
+the hashes are handed to ``User(password=...)``/``bulk_create`` instead of calling ``set_password`` per user.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable
+from typing import List
+from typing import Optional
+
+import django
+from django.apps import apps
+from django.contrib.auth.hashers import make_password
+
+
+def _init_worker() -> None:
+    # Workers started with "spawn" (or "forkserver") do not inherit the configured settings of the parent
+    if not apps.ready:
+        django.setup()
+
+
+def get_hashing_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Return a process pool ready to run ``make_password``, with one worker per core by default."""
+    return ProcessPoolExecutor(max_workers=max_workers or os.cpu_count(), initializer=_init_worker)
+
+
+def hash_passwords(
+    passwords: Iterable[str], pool: Optional[ProcessPoolExecutor] = None, chunksize: int = 8
+) -> List[str]:
+    """Hash passwords with the default hasher across a process pool.
+
+    Args:
+        passwords (Iterable[str]): The raw passwords.
+        pool (ProcessPoolExecutor): The pool to hash on, so it can be reused across batches. A pool is created and
+            shut down for this batch if not given.
+        chunksize (int): Passwords sent to a worker at once, to amortize the inter-process round-trips.
+
+    Returns:
+        List[str]: The hash of each password, in order, ready to be stored in ``User.password``.
+    """
+    passwords = list(passwords)
+    if pool is None:
+        with get_hashing_pool() as pool:
+            return hash_passwords(passwords, pool, chunksize)
+
+    return list(pool.map(make_password, passwords, chunksize=chunksize))
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from home.cache.profile_cache import invalidate_profile_context
+from volt.models import Profile
+
+
+@receiver(post_save, sender=Profile)
+def invalidate_cached_profile(sender, instance, **kwargs):
+    """Drop the cached profile page whenever the profile data changes."""
+    invalidate_profile_context(str(instance.graph_id))
@@ -0,0 +1,116 @@
+"""Query and graph-call budgets for request tests.
+
+``RequestBudget`` records the Django DB queries and the ``AgraphManager``/``UserManager`` calls made inside its block.
+Graph calls are recorded and served offline by the in-memory backend of ``home.fake_agraph``, so no AllegroGraph is
+needed. Tests compare the recorded counts against the budgets declared in ``ENDPOINT_BUDGETS``. Budgets count the
+queries of the application itself: budget tests run with ``home.tests.caches.IN_MEMORY_CACHES``, so the queries of
+the database cache backend are left out.
+"""
+from contextlib import contextmanager
+from contextlib import ExitStack
+from dataclasses import dataclass
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Tuple
+from unittest import mock
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from home import agraph_clients
+from home.fake_agraph import FakeAgraphManager
+from home.fake_agraph import FakeUserManager
+
+
+@dataclass
+class Budget:
+    queries: int
+    graph_calls: int
+
+
+# Maximum number of DB queries and graph calls of a request to each endpoint, keyed on URL name. The query budgets
+# assume the shared caches are not database-backed, as with IN_MEMORY_CACHES or Redis: with the default DatabaseCache
+# every cache read and write of a request adds one query on top of them.
+ENDPOINT_BUDGETS = {
+    # Session, authenticated user and the viewed user with its profile; contributions, activities and creations
+    "profile": Budget(queries=3, graph_calls=3),
+    # Username uniqueness, invite code check, savepoint, user and profile INSERTs, invite code redemption, user refresh
+    # and its profile, graph outbox INSERT, savepoint release. The graph user is created later by drain_graph_outbox
+    "register": Budget(queries=10, graph_calls=0),
+    # Session, authenticated user, savepoint, existing codes, one INSERT per 1000 codes, savepoint release
+    "generate_invite_codes": Budget(queries=6, graph_calls=0),
+}
+
+
+class GraphCallRecorder:
+    """Wrapper of a graph client that records every call before forwarding it."""
+
+    def __init__(self, name: str, calls: List[Tuple[str, str]], client: Any):
+        self._name = name
+        self._calls = calls
+        self._client = client
+
+    def __getattr__(self, method: str):
+        def call(*args, **kwargs):
+            self._calls.append((self._name, method))
+            return getattr(self._client, method)(*args, **kwargs)
+
+        return call
+
+
+class RequestBudget:
+    def __init__(self):
+        self.graph_calls: List[Tuple[str, str]] = []
+        self._stack = ExitStack()
+        self._queries = CaptureQueriesContext(connection)
+
+    @property
+    def queries(self) -> List[Dict[str, str]]:
+        return self._queries.captured_queries
+
+    def __enter__(self) -> "RequestBudget":
+        for name, pool, client in (
+            ("UserManager", agraph_clients.user_manager_pool, FakeUserManager()),
+            ("AgraphManager", agraph_clients.agraph_manager_pool, FakeAgraphManager()),
+        ):
+            recorder = GraphCallRecorder(name, self.graph_calls, client)
+            self._stack.enter_context(mock.patch.object(pool, "client", _checkout(recorder)))
+        self._stack.enter_context(self._queries)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stack.__exit__(*exc_info)
+
+    def check(self, budget: Budget) -> List[str]:
+        """Return a description of every budget overrun, or an empty list."""
+        errors = []
+        if len(self.queries) > budget.queries:
+            sql = "\n".join(q["sql"] for q in self.queries)
+            errors.append(f"{len(self.queries)} queries exceed the budget of {budget.queries}:\n{sql}")
+        if len(self.graph_calls) > budget.graph_calls:
+            errors.append(
+                f"{len(self.graph_calls)} graph calls exceed the budget of {budget.graph_calls}: {self.graph_calls}"
+            )
+        return errors
+
+
+def _checkout(client: Any):
+    @contextmanager
+    def client_checkout() -> Iterator[Any]:
+        yield client
+
+    return client_checkout
+
+
+class RequestBudgetMixin:
+    """TestCase mixin to assert that a request stays within the budget of its endpoint."""
+
+    @contextmanager
+    def assertWithinBudget(self, endpoint: str) -> Iterator[RequestBudget]:
+        with RequestBudget() as budget:
+            yield budget
+        errors = budget.check(ENDPOINT_BUDGETS[endpoint])
+        if errors:
+            self.fail(f"Request to {endpoint} is over budget:\n" + "\n".join(errors))  # type: ignore
@@ -0,0 +1,55 @@
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import override_settings
+from django.test import SimpleTestCase
+
+from home.cache.card_cache import aget_or_render_card_fragment
+from home.cache.card_cache import CARD_CACHE_ALIAS
+from home.cache.card_cache import get_or_render_card_fragment
+from home.cache.card_cache import invalidate_card_fragment
+from home.tests.caches import IN_MEMORY_CACHES
+
+
+@override_settings(CACHES=IN_MEMORY_CACHES)
+class CardCacheTests(SimpleTestCase):
+    def setUp(self):
+        caches[CARD_CACHE_ALIAS].clear()
+        self.render = mock.MagicMock(return_value="<div>card</div>")
+
+    def test_fragment_is_rendered_once(self):
+        """Test that a cached fragment is reused with a stable ETag."""
+        first = get_or_render_card_fragment("card-id", self.render)
+        second = get_or_render_card_fragment("card-id", self.render)
+
+        self.assertEqual(first.html, "<div>card</div>")
+        self.assertEqual(first.etag, second.etag)
+        self.assertEqual(self.render.call_count, 1)
+
+    async def test_async_fragment_is_rendered_once(self):
+        """Test that the async variant shares the cached fragment of the sync one."""
+        render = mock.AsyncMock(return_value="<div>card</div>")
+        first = await aget_or_render_card_fragment("card-id", render)
+        second = await aget_or_render_card_fragment("card-id", render)
+
+        self.assertEqual(first, second)
+        self.assertEqual(first, get_or_render_card_fragment("card-id", self.render))
+        self.assertEqual(render.await_count, 1)
+        self.render.assert_not_called()
+
+    def test_invalidate_forces_render(self):
+        """Test that an edited card is rendered again."""
+        get_or_render_card_fragment("card-id", self.render)
+        invalidate_card_fragment("card-id")
+        get_or_render_card_fragment("card-id", self.render)
+
+        self.assertEqual(self.render.call_count, 2)
+
+    def test_template_version_change_forces_render(self):
+        """Test that bumping the template version discards fragments rendered with the old templates."""
+        with override_settings(CARD_TEMPLATE_VERSION="1"):
+            get_or_render_card_fragment("card-id", self.render)
+        with override_settings(CARD_TEMPLATE_VERSION="2"):
+            get_or_render_card_fragment("card-id", self.render)
+
+        self.assertEqual(self.render.call_count, 2)
@@ -0,0 +1,79 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.test import override_settings
+from django.test import TestCase
+
+from home.cache.profile_cache import get_or_build_profile_context
+from home.cache.profile_cache import invalidate_profile_context
+from home.cache.profile_cache import mark_graph_changed
+from home.cache.profile_cache import mark_graphs_changed
+from home.cache.profile_cache import PROFILE_CACHE_ALIAS
+from home.tests.caches import IN_MEMORY_CACHES
+
+
+class ProfileCacheTests(TestCase):
+    def setUp(self):
+        caches[PROFILE_CACHE_ALIAS].clear()
+        self.build = mock.MagicMock(return_value={"name": "John"})
+
+    def test_context_is_built_once(self):
+        """Test that a cached profile context is reused instead of being rebuilt."""
+        first = get_or_build_profile_context("graph-id", self.build)
+        second = get_or_build_profile_context("graph-id", self.build)
+
+        self.assertEqual(first, {"name": "John"})
+        self.assertEqual(second, {"name": "John"})
+        self.assertEqual(self.build.call_count, 1)
+
+    def test_invalidate_forces_rebuild(self):
+        """Test that invalidating a profile context rebuilds it on the next access."""
+        get_or_build_profile_context("graph-id", self.build)
+        invalidate_profile_context("graph-id")
+        get_or_build_profile_context("graph-id", self.build)
+
+        self.assertEqual(self.build.call_count, 2)
+
+    def test_profile_save_invalidates_context(self):
+        """Test that saving a Profile drops its cached context."""
+        user = User.objects.create_user(username="testuser", password="testpassword")
+        graph_id = str(user.profile.graph_id)
+        get_or_build_profile_context(graph_id, self.build)
+
+        user.profile.pretty_printed_user_info = {"name": "Jane"}
+        user.profile.save()
+        get_or_build_profile_context(graph_id, self.build)
+
+        self.assertEqual(self.build.call_count, 2)
+
+    def test_mark_graph_changed(self):
+        """Test that a graph write is recorded on the profile and drops its cached context."""
+        user = User.objects.create_user(username="testuser", password="testpassword")
+        graph_id = str(user.profile.graph_id)
+        get_or_build_profile_context(graph_id, self.build)
+
+        mark_graph_changed(graph_id)
+        get_or_build_profile_context(graph_id, self.build)
+
+        user.profile.refresh_from_db()
+        self.assertIsNotNone(user.profile.graph_updated_at)
+        self.assertEqual(self.build.call_count, 2)
+
+    @override_settings(CACHES=IN_MEMORY_CACHES)
+    def test_mark_graphs_changed(self):
+        """Test that graph writes for several users are recorded with a single UPDATE and drop their contexts."""
+        users = [User.objects.create_user(username=f"testuser{i}", password="testpassword") for i in range(2)]
+        graph_ids = [str(user.profile.graph_id) for user in users]
+        for graph_id in graph_ids:
+            get_or_build_profile_context(graph_id, self.build)
+
+        with self.assertNumQueries(1):
+            mark_graphs_changed(graph_ids)
+        for graph_id in graph_ids:
+            get_or_build_profile_context(graph_id, self.build)
+
+        for user in users:
+            user.profile.refresh_from_db()
+            self.assertIsNotNone(user.profile.graph_updated_at)
+        self.assertEqual(self.build.call_count, 4)
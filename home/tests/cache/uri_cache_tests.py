@@ -0,0 +1,27 @@
+from django.test import SimpleTestCase
+
+from home.cache import uri_cache
+from home.views import utils
+
+
+class UriCacheTests(SimpleTestCase):
+    def setUp(self):
+        uri_cache.clear_uri_caches()
+
+    def test_memoized_helpers_match_originals(self):
+        """Test that the memoized helpers return the same values as the original ones."""
+        uri = "http://helioweb.org/card/1234"
+        encoded = utils.encode_uri(uri)
+
+        self.assertEqual(uri_cache.encode_uri(uri), encoded)
+        self.assertEqual(uri_cache.decode_uri(encoded), utils.decode_uri(encoded))
+        self.assertEqual(uri_cache.get_label_from_uri(uri), utils.get_label_from_uri(uri))
+
+    def test_repeated_calls_hit_the_cache(self):
+        """Test that repeated conversions of the same URI are served from the memo."""
+        for _ in range(3):
+            uri_cache.encode_uri("http://helioweb.org/card/1234")
+
+        info = uri_cache.uri_cache_info()["encode_uri"]
+        self.assertEqual(info.misses, 1)
+        self.assertEqual(info.hits, 2)
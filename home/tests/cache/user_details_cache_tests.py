@@ -0,0 +1,51 @@
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import override_settings
+from django.test import SimpleTestCase
+
+from home.cache.profile_cache import PROFILE_CACHE_ALIAS
+from home.cache.user_details_cache import get_users_details
+from home.cache.user_details_cache import invalidate_user_details
+from home.tests.caches import IN_MEMORY_CACHES
+
+
+@override_settings(CACHES=IN_MEMORY_CACHES)
+class UserDetailsCacheTests(SimpleTestCase):
+    def setUp(self):
+        caches[PROFILE_CACHE_ALIAS].clear()
+        self.user_manager = mock.MagicMock()
+        self.user_manager.get_users_details.side_effect = lambda labels: {label: f"details-{label}" for label in labels}
+
+    def test_graph_round_trips_per_number_of_taggers(self):
+        """Test that all the taggers are fetched with a single graph round trip, and never again while cached."""
+        for num_taggers in (1, 10, 50):
+            caches[PROFILE_CACHE_ALIAS].clear()
+            self.user_manager.get_users_details.reset_mock()
+            labels = [f"user{i}" for i in range(num_taggers)]
+
+            details = get_users_details(labels, self.user_manager)
+            self.user_manager.get_users_details.assert_called_once_with(labels)
+            self.user_manager.get_user_details.assert_not_called()
+            self.assertEqual(details["user0"], "details-user0")
+
+            get_users_details(labels, self.user_manager)
+            self.assertEqual(self.user_manager.get_users_details.call_count, 1)
+
+    def test_only_missing_users_are_fetched(self):
+        """Test that a partially cached batch only fetches the missing users."""
+        get_users_details(["user1", "user2"], self.user_manager)
+        self.user_manager.get_users_details.reset_mock()
+
+        details = get_users_details(["user1", "user2", "user3"], self.user_manager)
+
+        self.user_manager.get_users_details.assert_called_once_with(["user3"])
+        self.assertEqual(set(details.keys()), {"user1", "user2", "user3"})
+
+    def test_invalidate_user_details(self):
+        """Test that invalidated users are fetched again."""
+        get_users_details(["user1"], self.user_manager)
+        invalidate_user_details("user1")
+        get_users_details(["user1"], self.user_manager)
+
+        self.assertEqual(self.user_manager.get_users_details.call_count, 2)
@@ -0,0 +1,13 @@
+"""In-memory replacement of the shared caches for tests.
+
+The shared cache backend (``DatabaseCache`` by default) reads and writes through the database, so its queries would
+count against ``assertNumQueries`` and the endpoint budgets, and ``SimpleTestCase`` would reject them. Tests that
+count queries or run without a database apply ``override_settings(CACHES=IN_MEMORY_CACHES)``, which keeps every alias
+with its timeout and key prefix but stores it in memory.
+"""
+from django.conf import settings
+
+IN_MEMORY_CACHES = {
+    alias: {**config, "BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": f"tests-{alias}"}
+    for alias, config in settings.CACHES.items()
+}
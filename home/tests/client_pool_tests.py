@@ -0,0 +1,78 @@
+import threading
+from queue import Empty
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from home.client_pool import ClientPool
+from home.client_pool import PooledClient
+
+
+class ClientPoolTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = mock.MagicMock(side_effect=lambda: mock.MagicMock())
+
+    def test_clients_are_reused(self):
+        """Test that a released client is handed out again instead of opening a new one."""
+        pool = ClientPool(self.factory, size=2)
+        with pool.client() as first:
+            pass
+        with pool.client() as second:
+            pass
+
+        self.assertIs(first, second)
+        self.assertEqual(self.factory.call_count, 1)
+
+    def test_prewarm_opens_every_client(self):
+        """Test that pre-warming creates the whole pool upfront."""
+        pool = ClientPool(self.factory, size=3)
+        pool.prewarm()
+
+        stats = pool.stats()
+        self.assertEqual(self.factory.call_count, 3)
+        self.assertEqual(stats.created, 3)
+        self.assertEqual(stats.idle, 3)
+        self.assertEqual(stats.in_use, 0)
+
+    def test_exhausted_pool_times_out(self):
+        """Test that checking out of an exhausted pool raises once the timeout expires."""
+        pool = ClientPool(self.factory, size=1, timeout=0.05)
+        with pool.client():
+            self.assertEqual(pool.stats().in_use, 1)
+            with self.assertRaises(Empty):
+                with pool.client():
+                    pass
+
+    def test_waiting_thread_gets_released_client(self):
+        """Test that a thread waiting on an exhausted pool gets the next released client."""
+        pool = ClientPool(self.factory, size=1, timeout=1)
+        checked_out = threading.Event()
+        release = threading.Event()
+
+        def hold_client():
+            with pool.client():
+                checked_out.set()
+                release.wait()
+
+        thread = threading.Thread(target=hold_client)
+        thread.start()
+        checked_out.wait()
+        threading.Timer(0.05, release.set).start()
+        with pool.client():
+            pass
+        thread.join()
+
+        stats = pool.stats()
+        self.assertEqual(stats.checkouts, 2)
+        self.assertGreater(stats.max_wait_seconds, 0)
+
+    def test_pooled_client_forwards_calls(self):
+        """Test that a PooledClient runs method calls on a pooled client and releases it."""
+        pool = ClientPool(self.factory, size=1)
+        client = PooledClient(pool)
+
+        client.get_user_details("user1")
+
+        with pool.client() as pooled:
+            pooled.get_user_details.assert_called_once_with("user1")
+        self.assertEqual(pool.stats().in_use, 0)
@@ -0,0 +1,57 @@
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.test import override_settings
+from django.test import TestCase
+from django.urls import reverse
+
+from home.cache.profile_cache import PROFILE_CACHE_ALIAS
+from home.fake_agraph import graph
+from home.tests.budgets import RequestBudgetMixin
+from home.tests.caches import IN_MEMORY_CACHES
+from volt.models import GraphUserOutbox
+from volt.models import InviteCode
+
+
+@override_settings(CACHES=IN_MEMORY_CACHES)
+class EndpointBudgetsTests(RequestBudgetMixin, TestCase):
+    def setUp(self):
+        caches[PROFILE_CACHE_ALIAS].clear()
+        graph.clear()
+        self.admin = User.objects.create_superuser(username="admin", password="supersecret")
+
+    def test_profile_budget(self):
+        """Test that rendering a profile stays within its query and graph call budget."""
+        self.client.login(username="admin", password="supersecret")
+
+        with self.assertWithinBudget("profile"):
+            response = self.client.get(reverse("profile", kwargs={"user_id": self.admin.id}))
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_register_budget(self):
+        """Test that registering a user stays within its query and graph call budget."""
+        invite_code = InviteCode.objects.create(created_by=self.admin)
+        post_data = {
+            "email": "newuser@example.com",
+            "password1": "Sup3r-secret-pass",
+            "password2": "Sup3r-secret-pass",
+            "invite_code": invite_code.code,
+        }
+
+        with self.assertWithinBudget("register"):
+            response = self.client.post(reverse("register"), data=post_data)
+
+        self.assertRedirects(response, "/accounts/login/", fetch_redirect_response=False)
+        self.assertTrue(GraphUserOutbox.objects.filter(payload__email="newuser@example.com").exists())
+
+    def test_generate_invite_codes_budget(self):
+        """Test that generating invite codes stays within its query budget."""
+        self.client.login(username="admin", password="supersecret")
+
+        with self.assertWithinBudget("generate_invite_codes"):
+            response = self.client.post(
+                reverse("generate_invite_codes"), data={"num_codes": 500, "source_event": "Conference"}
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(InviteCode.objects.filter(source_event="Conference").count(), 500)
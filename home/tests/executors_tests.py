@@ -0,0 +1,25 @@
+import threading
+import time
+from concurrent.futures import TimeoutError
+
+from django.test import SimpleTestCase
+
+from home.executors import run_concurrently
+
+
+class RunConcurrentlyTests(SimpleTestCase):
+    def test_results_are_keyed_by_name(self):
+        """Test that each result is returned under the name of its call."""
+        results = run_concurrently({"a": lambda: 1, "b": lambda: 2})
+        self.assertDictEqual(results, {"a": 1, "b": 2})
+
+    def test_calls_run_concurrently(self):
+        """Test that the calls overlap in time instead of running one after another."""
+        barrier = threading.Barrier(3, timeout=1)
+        results = run_concurrently({name: barrier.wait for name in ("a", "b", "c")}, timeout=2)
+        self.assertEqual(len(results), 3)
+
+    def test_slow_call_times_out(self):
+        """Test that a call exceeding the timeout raises a TimeoutError."""
+        with self.assertRaises(TimeoutError):
+            run_concurrently({"fast": lambda: 1, "slow": lambda: time.sleep(0.5)}, timeout=0.1)
@@ -0,0 +1,146 @@
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.test import override_settings
+from django.test import SimpleTestCase
+from django.test import TestCase
+
+from home.cache.card_cache import CARD_CACHE_ALIAS
+from home.cache.card_cache import get_or_render_card_fragment
+from home.fake_agraph import FakeAgraphManager
+from home.fake_agraph import FakeCard
+from home.fake_agraph import FakeUserManager
+from home.fake_agraph import graph
+from home.fake_agraph import InMemoryGraph
+from home.fake_agraph import USER_URI_PREFIX
+from home.tests.caches import IN_MEMORY_CACHES
+from volt.models import Profile
+
+
+class FakeAgraphTests(SimpleTestCase):
+    def setUp(self):
+        graph.clear()
+        self.user_manager = FakeUserManager()
+        self.agraph_manager = FakeAgraphManager()
+        self.user_manager.create_user(SimpleNamespace(user_id="user1", django_id="1", email="user1@example.com"))
+        self.user_manager.create_user(SimpleNamespace(user_id="user2", django_id="2", email="user2@example.com"))
+        graph.add_card(FakeCard(id="card1", label="Card 1", type="Study", created_by=f"{USER_URI_PREFIX}user1"))
+        graph.add_card(
+            FakeCard(
+                id="card2", label="Card 2", type="Method", created_by=f"{USER_URI_PREFIX}user2", tagged_users=["user1"]
+            )
+        )
+
+    def test_user_queries(self):
+        """Test that creations, contributions and activities are derived from the stored cards."""
+        self.assertEqual([c.id for c in self.user_manager.get_user_creations("user1")], ["card1"])
+        self.assertEqual([c.id for c in self.user_manager.get_user_contributions("user1")], ["card2"])
+        self.assertEqual([c.id for c in self.user_manager.get_user_activities("user1")], ["card1", "card2"])
+        user = self.user_manager.get_user_details("user2")
+        assert user is not None
+        self.assertEqual(user.email, "user2@example.com")
+        details = self.user_manager.get_users_details(["user1", "unknown"])
+        self.assertEqual(details["user1"].email, "user1@example.com")
+        self.assertIsNone(details["unknown"])
+
+    @override_settings(AGRAPH_FAKE_LATENCY=0.05)
+    def test_create_users_in_one_round_trip(self):
+        """Test that a batch of users is created with the latency of a single call."""
+        users = [SimpleNamespace(user_id=f"batch{i}", email=f"batch{i}@example.com") for i in range(3)]
+
+        start = time.monotonic()
+        self.user_manager.create_users(users)
+
+        self.assertLess(time.monotonic() - start, 0.1)
+        self.assertEqual([graph.get_user(f"batch{i}") for i in range(3)], users)
+
+    def test_returned_cards_are_copies(self):
+        """Test that mutating a returned card does not change the store."""
+        card = self.agraph_manager.get_card_details("card1")
+        assert card is not None
+        card.id = "encoded"
+
+        stored = self.agraph_manager.get_card_details("card1")
+        assert stored is not None
+        self.assertEqual(stored.id, "card1")
+
+    @override_settings(AGRAPH_FAKE_LATENCY=0.05)
+    def test_latency(self):
+        """Test that every call takes at least the configured latency."""
+        start = time.monotonic()
+        self.user_manager.get_user_creations("user1")
+
+        self.assertGreaterEqual(time.monotonic() - start, 0.05)
+
+    def test_dump_and_load(self):
+        """Test that a dumped store is loaded back with the same users and cards."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "graph.json")
+            graph.dump(path)
+            loaded = InMemoryGraph()
+            loaded.load(path)
+
+        user = loaded.get_user("user1")
+        card = loaded.get_card("card2")
+        assert user is not None and card is not None
+        self.assertEqual(user.email, "user1@example.com")
+        self.assertEqual(card.tagged_users, ["user1"])
+
+    def test_load_missing_file(self):
+        """Test that a data file that was not seeded yet loads an empty graph when allowed to be missing."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "graph.json")
+            loaded = InMemoryGraph()
+            loaded.load(path, missing_ok=True)
+
+            with self.assertRaises(FileNotFoundError):
+                loaded.load(path)
+
+        self.assertEqual(loaded.users, {})
+        self.assertEqual(loaded.cards, {})
+
+
+@override_settings(CACHES=IN_MEMORY_CACHES)
+class FakeCardWritesTests(TestCase):
+    def setUp(self):
+        graph.clear()
+        caches[CARD_CACHE_ALIAS].clear()
+        self.agraph_manager = FakeAgraphManager()
+        self.user = User.objects.create_user(username="testuser", password="testpassword")
+        Profile.objects.filter(user=self.user).update(contribution_counts={})
+        self.graph_id = str(self.user.profile.graph_id)
+
+    def create_card(self, card_id, **kwargs):
+        self.agraph_manager.create_card(
+            FakeCard(id=card_id, label=card_id, type="Study", created_by=f"{USER_URI_PREFIX}{self.graph_id}", **kwargs)
+        )
+
+    def test_card_writes_update_contribution_counts(self):
+        """Test that creating and deleting public, non-stub cards updates the creator's contribution counts."""
+        self.create_card("card1")
+        self.create_card("card2")
+        self.create_card("private", is_public="no")
+        self.create_card("stub", is_stub="yes")
+        self.agraph_manager.delete_card("card1")
+
+        self.user.profile.refresh_from_db()
+        self.assertDictEqual(self.user.profile.contribution_counts, {"Study": 1})
+        self.assertIsNotNone(self.user.profile.graph_updated_at)
+        self.assertIsNone(graph.get_card("card1"))
+
+    def test_card_writes_drop_card_fragment(self):
+        """Test that a cached card fragment is rendered again once the card was written."""
+        self.create_card("card1")
+        render = mock.MagicMock(return_value="<div>card1</div>")
+        get_or_render_card_fragment("card1", render)
+
+        self.agraph_manager.delete_card("card1")
+        self.create_card("card1")
+        get_or_render_card_fragment("card1", render)
+
+        self.assertEqual(render.call_count, 2)
@@ -0,0 +1,51 @@
+import io
+import json
+import os
+import tempfile
+
+from django.test import SimpleTestCase
+
+from home.json_stream import iter_json_array
+from home.json_stream import iter_json_records
+
+RECORDS = [
+    {"email": "john@example.com", "user_info": {"topics": ["a", "b"]}},
+    {"email": "jane@example.com", "note": "brackets ] and , in strings"},
+    42,
+    "text",
+]
+
+
+class IterJsonArrayTests(SimpleTestCase):
+    def test_records_span_buffers(self):
+        """Test that records cut across read buffers are decoded like json.load does."""
+        for buffer_size in (1, 2, 7, 1024):
+            with self.subTest(buffer_size=buffer_size):
+                f = io.StringIO(json.dumps(RECORDS, indent=2))
+                self.assertEqual(list(iter_json_array(f, buffer_size=buffer_size)), RECORDS)
+
+    def test_trailing_number_is_not_cut(self):
+        """Test that a number at the end of a buffer is not yielded before the rest of it is read."""
+        f = io.StringIO("[1234, 5678]")
+        self.assertEqual(list(iter_json_array(f, buffer_size=2)), [1234, 5678])
+
+    def test_empty_array(self):
+        """Test that an empty array yields no records."""
+        self.assertEqual(list(iter_json_array(io.StringIO(" [ ] "))), [])
+
+    def test_invalid_documents_raise(self):
+        """Test that documents which are not a complete JSON array raise a ValueError."""
+        for document in ('{"a": 1}', '[{"a": 1}', '[{"a": }]'):
+            with self.subTest(document=document), self.assertRaises(ValueError):
+                list(iter_json_array(io.StringIO(document)))
+
+
+class IterJsonRecordsTests(SimpleTestCase):
+    def test_json_lines(self):
+        """Test that .jsonl files are read one record per line, skipping blank lines."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "users.jsonl")
+            with open(path, "w") as f:
+                f.write("\n".join(json.dumps(r) for r in RECORDS) + "\n\n")
+
+            self.assertEqual(list(iter_json_records(path)), RECORDS)
@@ -0,0 +1,40 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+
+from volt.models import Profile
+
+
+def _card(card_type, is_public="yes", is_stub="no"):
+    return SimpleNamespace(type=card_type, is_public=is_public, is_stub=is_stub)
+
+
+@mock.patch("home.management.commands.backfill_contribution_counts.user_manager")
+class BackfillContributionCountsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpassword")
+        self.counted = User.objects.create_user(username="counted", password="testpassword")
+        Profile.objects.filter(user=self.counted).update(contribution_counts={"Study": 7})
+
+    def test_missing_counts_are_filled(self, user_manager):
+        """Test that profiles without counts get their public, non-stub cards counted and others are left alone."""
+        user_manager.get_user_creations.return_value = [
+            _card("Study"), _card("Study"), _card("Method"), _card("Study", is_public="no"), _card("Method", is_stub="yes")
+        ]
+
+        call_command("backfill_contribution_counts", stdout=mock.MagicMock())
+
+        user_manager.get_user_creations.assert_called_once_with(str(self.user.profile.graph_id))
+        self.assertDictEqual(Profile.objects.get(user=self.user).contribution_counts, {"Study": 2, "Method": 1})
+        self.assertDictEqual(Profile.objects.get(user=self.counted).contribution_counts, {"Study": 7})
+
+    def test_graph_failure_leaves_counts_missing(self, user_manager):
+        """Test that profiles whose cards could not be fetched keep falling back to the fetched cards."""
+        user_manager.get_user_creations.side_effect = ConnectionError("graph unavailable")
+
+        call_command("backfill_contribution_counts", stdout=mock.MagicMock())
+
+        self.assertIsNone(Profile.objects.get(user=self.user).contribution_counts)
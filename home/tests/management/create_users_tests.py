@@ -0,0 +1,179 @@
+import json
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import override_settings
+from django.test import SimpleTestCase
+from django.test import TestCase
+
+from home.management.commands.create_users import Checkpoint
+from home.management.commands.create_users import Command
+from volt.models import GraphUserOutbox
+
+
+def _interrupt_after_first_chunk(create_chunk):
+    """Wrap a chunk creation method so the run is interrupted once the first chunk is committed."""
+    chunks: list[list[dict]] = []
+
+    def wrapper(command, users):
+        if chunks:
+            raise RuntimeError("interrupted")
+        chunks.append(users)
+        return create_chunk(command, users)
+
+    return wrapper
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+@mock.patch(
+    "home.management.commands.create_users.get_hashing_pool", side_effect=lambda: ThreadPoolExecutor(max_workers=2)
+)
+@mock.patch("volt.management.commands.drain_graph_outbox.mark_graphs_changed")
+@mock.patch("volt.management.commands.drain_graph_outbox.GraphUser", side_effect=lambda **kwargs: kwargs)
+@mock.patch("volt.management.commands.drain_graph_outbox.user_manager")
+class CreateUsersTests(TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.users_file = os.path.join(tmp_dir.name, "users.json")
+        self.users = [
+            {"email": "admin@example.com", "password": "secret-0", "is_superuser": True, "givenName": "Admin"},
+            {"email": "user1@example.com", "password": "secret-1", "is_superuser": False, "givenName": "One"},
+            {"email": "user2@example.com", "password": "secret-2", "is_superuser": False, "givenName": "Two"},
+        ]
+        with open(self.users_file, "w") as f:
+            json.dump(self.users, f)
+
+    def create_users(self, *args):
+        call_command("create_users", "--file", self.users_file, *args, stdout=mock.MagicMock())
+
+    def assertUsersCreated(self, user_manager):
+        self.assertEqual(User.objects.filter(username__endswith="@example.com").count(), 3)
+        admin = User.objects.get(username="admin@example.com")
+        self.assertTrue(admin.is_superuser)
+        self.assertTrue(admin.check_password("secret-0"))
+        self.assertFalse(GraphUserOutbox.objects.filter(processed_at__isnull=True).exists())
+        created = {user["email"]: user for call in user_manager.create_users.call_args_list for user in call.args[0]}
+        self.assertEqual(set(created), {user["email"] for user in self.users})
+        self.assertEqual(created["admin@example.com"]["user_id"], str(admin.profile.graph_id))
+        self.assertEqual(created["admin@example.com"]["django_id"], str(admin.id))
+
+    def test_create_users(self, user_manager, graph_user, mark_graphs_changed, get_hashing_pool):
+        """Test that users, profiles and graph users are created one by one."""
+        self.create_users()
+
+        self.assertUsersCreated(user_manager)
+        get_hashing_pool.assert_not_called()
+
+    def test_bulk_create_users(self, user_manager, graph_user, mark_graphs_changed, get_hashing_pool):
+        """Test that users, profiles and graph users are created in bulk, with passwords hashed on the pool."""
+        self.create_users("--bulk", "--chunk-size", "2")
+
+        self.assertUsersCreated(user_manager)
+        get_hashing_pool.assert_called_once()
+
+    def test_existing_users_are_skipped(self, user_manager, graph_user, mark_graphs_changed, get_hashing_pool):
+        """Test that users that already exist are neither created again nor queued for the graph."""
+        User.objects.create_user(username="user1@example.com", password="other")
+
+        for args in ((), ("--bulk",)):
+            with self.subTest(args=args):
+                self.create_users(*args)
+
+                self.assertEqual(User.objects.filter(username__endswith="@example.com").count(), 3)
+                self.assertTrue(User.objects.get(username="user1@example.com").check_password("other"))
+                self.assertEqual(GraphUserOutbox.objects.count(), 2)
+
+    def test_graph_failure_is_retried_by_next_run(self, user_manager, graph_user, mark_graphs_changed, get_hashing_pool):
+        """Test that graph users that could not be created stay queued and are created by the next run."""
+        for args in ((), ("--bulk",)):
+            with self.subTest(args=args):
+                User.objects.filter(username__endswith="@example.com").delete()
+                GraphUserOutbox.objects.all().delete()
+                user_manager.reset_mock()
+                user_manager.create_users.side_effect = ConnectionError("graph unavailable")
+                user_manager.create_user.side_effect = ConnectionError("graph unavailable")
+
+                self.create_users(*args)
+
+                self.assertEqual(User.objects.filter(username__endswith="@example.com").count(), 3)
+                self.assertEqual(GraphUserOutbox.objects.filter(processed_at__isnull=True, attempts=1).count(), 3)
+
+                user_manager.reset_mock()
+                user_manager.create_users.side_effect = None
+                user_manager.create_user.side_effect = None
+                self.create_users(*args)
+
+                self.assertUsersCreated(user_manager)
+
+    def test_resume_skips_checkpointed_users(self, user_manager, graph_user, mark_graphs_changed, get_hashing_pool):
+        """Test that a resumed run starts after the users saved in the checkpoint and clears it when done."""
+        Checkpoint(f"{self.users_file}.checkpoint").save(2)
+
+        self.create_users("--resume")
+
+        created = User.objects.filter(username__endswith="@example.com").values_list("username", flat=True)
+        self.assertEqual(list(created), ["user2@example.com"])
+        self.assertFalse(os.path.exists(f"{self.users_file}.checkpoint"))
+
+    def test_interrupted_run_is_resumed(self, user_manager, graph_user, mark_graphs_changed, get_hashing_pool):
+        """Test that a run interrupted while the graph is down is completed by a resumed run, in both modes."""
+        for args, method in (((), "create_users"), (("--bulk",), "bulk_create_users")):
+            with self.subTest(args=args):
+                User.objects.filter(username__endswith="@example.com").delete()
+                GraphUserOutbox.objects.all().delete()
+                user_manager.reset_mock()
+                user_manager.create_users.side_effect = ConnectionError("graph unavailable")
+                user_manager.create_user.side_effect = ConnectionError("graph unavailable")
+
+                with mock.patch.object(Command, method, _interrupt_after_first_chunk(getattr(Command, method))):
+                    with self.assertRaises(RuntimeError):
+                        self.create_users("--chunk-size", "2", *args)
+
+                self.assertEqual(Checkpoint(f"{self.users_file}.checkpoint").load(), 2)
+                self.assertEqual(User.objects.filter(username__endswith="@example.com").count(), 2)
+                self.assertEqual(GraphUserOutbox.objects.filter(processed_at__isnull=True).count(), 2)
+
+                user_manager.reset_mock()
+                user_manager.create_users.side_effect = None
+                user_manager.create_user.side_effect = None
+                self.create_users("--chunk-size", "2", "--resume", *args)
+
+                self.assertUsersCreated(user_manager)
+                self.assertFalse(os.path.exists(f"{self.users_file}.checkpoint"))
+
+    def test_json_lines_file(self, user_manager, graph_user, mark_graphs_changed, get_hashing_pool):
+        """Test that users can be read from a JSON Lines file."""
+        self.users_file = f"{os.path.splitext(self.users_file)[0]}.jsonl"
+        with open(self.users_file, "w") as f:
+            f.writelines(json.dumps(user) + "\n" for user in self.users)
+
+        self.create_users("--bulk")
+
+        self.assertUsersCreated(user_manager)
+
+
+class CheckpointTests(SimpleTestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.checkpoint = Checkpoint(os.path.join(tmp_dir.name, "users.json.checkpoint"))
+
+    def test_missing_checkpoint(self):
+        """Test that a file without a checkpoint is processed from the start."""
+        self.assertEqual(self.checkpoint.load(), 0)
+
+    def test_save_load_and_clear(self):
+        """Test that a saved checkpoint is loaded back, replaced by later saves and removed by clear."""
+        self.checkpoint.save(1000)
+        self.checkpoint.save(2000)
+        self.assertEqual(self.checkpoint.load(), 2000)
+        self.assertFalse(os.path.exists(f"{self.checkpoint.path}.tmp"))
+
+        self.checkpoint.clear()
+        self.assertEqual(self.checkpoint.load(), 0)
+        self.checkpoint.clear()
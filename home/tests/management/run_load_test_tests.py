@@ -0,0 +1,22 @@
+import queue
+
+from django.test import SimpleTestCase
+
+from home.management.commands.run_load_test import Scenario
+
+
+class ScenarioTests(SimpleTestCase):
+    def test_scenario_urls(self):
+        """Test that the profile and card URLs of both the sync and async scenarios can be built."""
+        for async_views, prefix in ((False, "/profile/1/"), (True, "/async/profile/1/")):
+            with self.subTest(async_views=async_views):
+                scenario = Scenario(
+                    base_url="http://localhost:8000",
+                    manifest={"users": [], "cards": []},
+                    invite_codes=queue.Queue(),
+                    async_views=async_views,
+                    timeout=1.0,
+                )
+
+                self.assertEqual(scenario.profile_path(1), prefix)
+                self.assertEqual(scenario.card_path(1, "card-id"), f"{prefix}card/card-id/")
@@ -0,0 +1,24 @@
+from django.contrib.auth.hashers import check_password
+from django.test import override_settings
+from django.test import SimpleTestCase
+
+from home.password_hashing import get_hashing_pool
+from home.password_hashing import hash_passwords
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class HashPasswordsTests(SimpleTestCase):
+    def test_hashes_match_passwords_in_order(self):
+        """Test that each hash is returned at the position of its password and verifies against it."""
+        passwords = [f"password-{i}" for i in range(20)]
+        with get_hashing_pool(2) as pool:
+            hashes = hash_passwords(passwords, pool, chunksize=3)
+
+        self.assertEqual(len(hashes), len(passwords))
+        for password, hashed in zip(passwords, hashes):
+            self.assertTrue(check_password(password, hashed))
+
+    def test_pool_is_created_when_not_given(self):
+        """Test that a batch can be hashed without passing a pool."""
+        hashes = hash_passwords(["secret"])
+        self.assertTrue(check_password("secret", hashes[0]))
@@ -0,0 +1,325 @@
+import re
+import uuid
+from datetime import datetime
+from datetime import timezone
+from types import SimpleNamespace
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.http import Http404
+from django.test import AsyncClient
+from django.test import override_settings
+from django.test import RequestFactory
+from django.test import SimpleTestCase
+from django.test import TestCase
+from django.urls import reverse
+
+from home.cache.card_cache import CARD_CACHE_ALIAS
+from home.cache.card_cache import CardFragment
+from home.cache.profile_cache import PROFILE_CACHE_ALIAS
+from home.tests.caches import IN_MEMORY_CACHES
+from home.views.profile_views import _card_fragment_response
+from home.views.profile_views import _get_chart_pie_data
+from home.views.profile_views import _get_profile_validators
+from home.views.profile_views import _get_section_cards
+from home.views.profile_views import _paginate_cards
+from home.views.profile_views import _partition_cards
+
+
+def _card(card_id, card_type, created_by="http://example.org/user1", is_public="yes", is_stub="no"):
+    return SimpleNamespace(
+        id=card_id, label=card_id, type=card_type, created_by=created_by, is_public=is_public, is_stub=is_stub
+    )
+
+
+@mock.patch("home.views.profile_views.get_label_from_uri", lambda uri: uri.rsplit("/", 1)[-1])
+@mock.patch("home.views.profile_views.encode_uri", lambda uri: f"encoded-{uri}")
+class PartitionCardsTests(SimpleTestCase):
+    def test_cards_are_grouped_by_type(self):
+        """Test that cards are grouped by type and their ids encoded."""
+        cards = [_card("c1", "Study"), _card("c2", "Method"), _card("c3", "Study")]
+
+        partition = _partition_cards(cards)
+
+        self.assertEqual([c.id for c in partition.by_type["Study"]], ["encoded-c1", "encoded-c3"])
+        self.assertEqual([c.id for c in partition.by_type["Method"]], ["encoded-c2"])
+        self.assertDictEqual(partition.by_creator, {})
+
+    def test_private_and_stub_cards_are_dropped(self):
+        """Test that only public, non-stub cards are kept."""
+        cards = [_card("c1", "Study", is_public="no"), _card("c2", "Study", is_stub="yes"), _card("c3", "Study")]
+
+        partition = _partition_cards(cards, by_creator=True)
+
+        self.assertEqual([c.id for c in partition.by_type["Study"]], ["encoded-c3"])
+        self.assertEqual(list(partition.by_creator.keys()), ["user1"])
+
+    def test_cards_are_grouped_by_creator(self):
+        """Test that cards are grouped by creator label in the same pass."""
+        cards = [
+            _card("c1", "Study", created_by="http://example.org/user1"),
+            _card("c2", "Method", created_by="http://example.org/user2"),
+            _card("c3", "Study", created_by="http://example.org/user1"),
+        ]
+
+        partition = _partition_cards(cards, by_creator=True)
+
+        self.assertEqual([c.id for c in partition.by_creator["user1"]], ["encoded-c1", "encoded-c3"])
+        self.assertEqual([c.id for c in partition.by_creator["user2"]], ["encoded-c2"])
+        self.assertIs(partition.by_creator["user1"][0], partition.by_type["Study"][0])
+
+
+class PaginateCardsTests(SimpleTestCase):
+    def setUp(self):
+        self.cards = [_card(f"c{i}", "Study") for i in range(5)]
+
+    def test_first_page(self):
+        """Test that the first page starts at the first card and points to the next one."""
+        page, next_cursor = _paginate_cards(self.cards, None, 2)
+
+        self.assertEqual([c.id for c in page], ["c0", "c1"])
+        self.assertEqual(next_cursor, "c1")
+
+    def test_page_after_cursor(self):
+        """Test that a page starts right after the cursor card."""
+        page, next_cursor = _paginate_cards(self.cards, "c1", 2)
+
+        self.assertEqual([c.id for c in page], ["c2", "c3"])
+        self.assertEqual(next_cursor, "c3")
+
+    def test_last_page_has_no_cursor(self):
+        """Test that the last page does not return a next cursor."""
+        page, next_cursor = _paginate_cards(self.cards, "c3", 2)
+
+        self.assertEqual([c.id for c in page], ["c4"])
+        self.assertIsNone(next_cursor)
+
+    def test_unknown_cursor(self):
+        """Test that an unknown cursor raises a 404."""
+        with self.assertRaises(Http404):
+            _paginate_cards(self.cards, "unknown", 2)
+
+    def test_grouped_section_is_flattened(self):
+        """Test that cards grouped by type are flattened keeping each type contiguous."""
+        context = {"created_cards": {"Study": [_card("c1", "Study")], "Method": [_card("c2", "Method")]}}
+
+        cards = _get_section_cards(context, "created_cards")
+
+        self.assertEqual([c.id for c in cards], ["c1", "c2"])
+
+
+class ChartPieDataTests(SimpleTestCase):
+    def test_percentages(self):
+        """Test that contribution counts are turned into percentages."""
+        self.assertEqual(_get_chart_pie_data({"Study": 3, "Method": 1}), '{"Study": 75, "Method": 25}')
+
+    def test_no_contributions(self):
+        """Test that a user without contributions gets an empty chart instead of a division by zero."""
+        self.assertEqual(_get_chart_pie_data({}), "{}")
+
+
+class CardFragmentResponseTests(SimpleTestCase):
+    def setUp(self):
+        self.fragment = CardFragment(html="<div>card</div>", etag='"abc"')
+
+    def test_full_response(self):
+        """Test that a first request gets the fragment and its ETag."""
+        response = _card_fragment_response(RequestFactory().get("/"), self.fragment)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b"<div>card</div>")
+        self.assertEqual(response["ETag"], '"abc"')
+
+    def test_not_modified_response(self):
+        """Test that a repeat viewer with a matching ETag gets a 304."""
+        request = RequestFactory().get("/", HTTP_IF_NONE_MATCH='"abc"')
+
+        response = _card_fragment_response(request, self.fragment)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], '"abc"')
+
+
+class ProfileValidatorsTests(SimpleTestCase):
+    def setUp(self):
+        self.profile = SimpleNamespace(
+            graph_id=uuid.uuid4(),
+            updated_at=datetime.fromtimestamp(1700000000, timezone.utc),
+            graph_updated_at=datetime.fromtimestamp(1700000100, timezone.utc),
+        )
+        self.user = SimpleNamespace(id=1, profile=self.profile)
+        self.request = SimpleNamespace(user=SimpleNamespace(pk=2))
+
+    def test_last_modified_is_latest_change(self):
+        """Test that the last modification is the latest of the profile save and the graph write."""
+        _, last_modified = _get_profile_validators(self.request, self.user)
+        self.assertEqual(last_modified, 1700000100)
+
+    def test_etag_changes_with_graph_write(self):
+        """Test that a graph write changes the ETag."""
+        etag, _ = _get_profile_validators(self.request, self.user)
+        self.profile.graph_updated_at = datetime.fromtimestamp(1700000200, timezone.utc)
+        new_etag, _ = _get_profile_validators(self.request, self.user)
+
+        self.assertNotEqual(etag, new_etag)
+
+    def test_last_modified_without_graph_write(self):
+        """Test that a profile whose graph data was never written falls back to its own modification time."""
+        self.profile.graph_updated_at = None
+        _, last_modified = _get_profile_validators(self.request, self.user)
+        self.assertEqual(last_modified, 1700000000)
+
+    def test_etag_depends_on_viewer(self):
+        """Test that two viewers of the same profile get different ETags."""
+        etag, _ = _get_profile_validators(self.request, self.user)
+        other_etag, _ = _get_profile_validators(SimpleNamespace(user=SimpleNamespace(pk=3)), self.user)
+
+        self.assertNotEqual(etag, other_etag)
+
+
+@mock.patch(
+    "home.views.profile_views.run_concurrently",
+    return_value={"contributions": [], "activities": [], "creations": []},
+)
+@override_settings(CACHES=IN_MEMORY_CACHES)
+class ProfileViewQueriesTests(TestCase):
+    def setUp(self):
+        caches[PROFILE_CACHE_ALIAS].clear()
+        self.user = User.objects.create_user(username="testuser", password="testpassword")
+        self.client.login(username="testuser", password="testpassword")
+        self.url = reverse("profile", kwargs={"user_id": self.user.id})
+
+    def test_profile_query_count(self, mock_graph):
+        """Test that the profile page loads the viewed user and their profile in a single query."""
+        # Session, authenticated user and the viewed user with its profile
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_revalidated_profile_query_count(self, mock_graph):
+        """Test that a revalidated profile page is answered with a 304 without more queries or graph calls."""
+        etag = self.client.get(self.url)["ETag"]
+        mock_graph.reset_mock()
+
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertFalse(mock_graph.called)
+
+    def test_unknown_user(self, mock_graph):
+        """Test that the profile of an unknown user is a 404."""
+        response = self.client.get(reverse("profile", kwargs={"user_id": self.user.id + 1}))
+        self.assertEqual(response.status_code, 404)
+
+
+def _section_graph_data(calls):
+    # Fresh cards on every build, since building the context encodes their ids in place
+    creations = [_card(f"c{i}", "Study") for i in (1, 2, 3)] + [_card(f"c{i}", "Method") for i in (4, 5)]
+    return {"contributions": [], "activities": [], "creations": creations}
+
+
+@mock.patch("home.views.profile_views.encode_uri", lambda uri: f"encoded-{uri}")
+@mock.patch("home.views.profile_views.run_concurrently", side_effect=_section_graph_data)
+@override_settings(CACHES=IN_MEMORY_CACHES, PROFILE_SECTION_PAGE_SIZE=2)
+class ProfileSectionViewTests(TestCase):
+    def setUp(self):
+        caches[PROFILE_CACHE_ALIAS].clear()
+        self.user = User.objects.create_user(username="testuser", password="testpassword")
+        self.client.login(username="testuser", password="testpassword")
+        self.url = reverse("profile_section", kwargs={"user_id": self.user.id, "section": "created_cards"})
+
+    def test_pages_follow_the_cursor(self, mock_graph):
+        """Test that following next_cursor lists every card once, under a single heading per type."""
+        pages = []
+        cursor = None
+        while True:
+            response = self.client.get(self.url, {"cursor": cursor} if cursor else {})
+            self.assertEqual(response.status_code, 200)
+            pages.append(response.content.decode())
+            cursor = response.context["next_cursor"]
+            if cursor is None:
+                break
+
+        html = "".join(pages)
+        self.assertEqual(len(pages), 3)
+        self.assertEqual(re.findall(r"<li>(\w+)\s*<ul", html), ["Study", "Method"])
+        self.assertEqual(re.findall(r"^\s*(c\d)\s*$", html, re.MULTILINE), ["c1", "c2", "c3", "c4", "c5"])
+        # Cards of a type started on an earlier page are appended to its group
+        self.assertIn('hx-swap-oob="beforeend:#created_cards-study-cards"', pages[1])
+        self.assertIn('hx-swap-oob="beforeend:#created_cards-method-cards"', pages[2])
+        self.assertIn('id="created_cards-study-cards"', pages[0])
+        self.assertIn('id="created_cards-method-cards"', pages[1])
+
+    def test_unknown_section(self, mock_graph):
+        """Test that an unknown section is a 404."""
+        response = self.client.get(reverse("profile_section", kwargs={"user_id": self.user.id, "section": "unknown"}))
+        self.assertEqual(response.status_code, 404)
+
+    def test_unknown_cursor(self, mock_graph):
+        """Test that a cursor that is not a card of the section is a 404."""
+        response = self.client.get(self.url, {"cursor": "unknown"})
+        self.assertEqual(response.status_code, 404)
+
+
+@mock.patch(
+    "home.views.profile_views._get_graph_queries",
+    return_value={"contributions": list, "activities": list, "creations": list},
+)
+@override_settings(CACHES=IN_MEMORY_CACHES)
+class AsyncProfileViewsTests(TestCase):
+    def setUp(self):
+        caches[PROFILE_CACHE_ALIAS].clear()
+        caches[CARD_CACHE_ALIAS].clear()
+        self.user = User.objects.create_user(username="testuser", password="testpassword")
+        self.graph_id = str(self.user.profile.graph_id)
+        self.async_client.force_login(self.user)
+        self.url = reverse("profile_async", kwargs={"user_id": self.user.id})
+        self.card_url = reverse("fetch_card_data_for_user_async", kwargs={"user_id": self.user.id, "card_id": "card"})
+
+    async def test_anonymous_user_is_redirected_to_login(self, mock_graph):
+        """Test that anonymous users are sent to the login page by the profile and card views."""
+        for url in (self.url, self.card_url):
+            with self.subTest(url=url):
+                response = await AsyncClient().get(url)
+
+                self.assertEqual(response.status_code, 302)
+                self.assertEqual(response.url, f"/accounts/login/?next={url}")
+
+    async def test_unknown_user(self, mock_graph):
+        """Test that the profile of an unknown user is a 404."""
+        response = await self.async_client.get(reverse("profile_async", kwargs={"user_id": self.user.id + 1}))
+        self.assertEqual(response.status_code, 404)
+
+    async def test_profile_is_rendered(self, mock_graph):
+        """Test that the profile page is rendered with its validators and revalidated without graph queries."""
+        response = await self.async_client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "profile.html")
+        self.assertIn("Last-Modified", response)
+        mock_graph.assert_called_once_with(self.graph_id)
+
+        mock_graph.reset_mock()
+        # The async request factory sends extra arguments as raw header names
+        revalidated = await self.async_client.get(self.url, **{"If-None-Match": response["ETag"]})
+
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated["ETag"], response["ETag"])
+        self.assertFalse(mock_graph.called)
+
+    @mock.patch("home.views.profile_views._render_card", return_value="<div>card</div>")
+    @mock.patch("home.views.profile_views._get_card")
+    async def test_card_fragment_is_rendered(self, mock_get_card, mock_render, mock_graph):
+        """Test that the card fragment is rendered once and then served from the cache."""
+        response = await self.async_client.get(self.card_url)
+        cached = await self.async_client.get(self.card_url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b"<div>card</div>")
+        self.assertEqual(cached.content, b"<div>card</div>")
+        self.assertEqual(cached["ETag"], response["ETag"])
+        mock_get_card.assert_called_once_with("card")
+        mock_render.assert_called_once_with(mock_get_card.return_value)
@@ -5,4 +5,16 @@ from home.views import profile_views
 urlpatterns = [
     path("", views.index, name="index"),
     path("profile/<int:user_id>/", profile_views.profile, name="profile"),
+    path("profile/<int:user_id>/sections/<str:section>/", profile_views.profile_section, name="profile_section"),
+    path(
+        "profile/<int:user_id>/card/<str:card_id>/",
+        profile_views.fetch_card_data_for_user,
+        name="fetch_card_data_for_user",
+    ),
+    path("async/profile/<int:user_id>/", profile_views.profile_async, name="profile_async"),
+    path(
+        "async/profile/<int:user_id>/card/<str:card_id>/",
+        profile_views.fetch_card_data_for_user_async,
+        name="fetch_card_data_for_user_async",
+    ),
 ]
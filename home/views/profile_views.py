@@ -1,78 +1,249 @@
+import asyncio
+import hashlib
 import json
 import logging
+from dataclasses import dataclass
+from dataclasses import field
+from functools import partial
 from typing import Any
+from typing import Callable
 from typing import Dict
+from typing import Iterable
 from typing import Optional
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
+from django.contrib.auth.views import redirect_to_login
 from django.http import Http404
+from django.http import HttpResponse
 from django.shortcuts import render
+from django.template.loader import render_to_string
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 
-from home.agraph.agraph_manager import AgraphManager
 from home.agraph.agraph_models import InstanceWithLabel
-from home.agraph.user_manager import UserManager
+from home.agraph_clients import agraph_manager
+from home.agraph_clients import user_manager
+from home.cache.card_cache import aget_or_render_card_fragment
+from home.cache.card_cache import CardFragment
+from home.cache.card_cache import get_or_render_card_fragment
+from home.cache.profile_cache import aget_or_build_profile_context
+from home.cache.profile_cache import get_or_build_profile_context
+from home.cache.uri_cache import decode_uri
+from home.cache.uri_cache import encode_uri
+from home.cache.uri_cache import get_label_from_uri
+from home.cache.user_details_cache import get_users_details
 from home.constants import card_constants
 from home.constants import profile_constants as constants
-from home.views.utils import decode_uri
-from home.views.utils import encode_uri
+from home.executors import run_concurrently
 from home.views.utils import get_card_context
-from home.views.utils import get_label_from_uri
 from home.views.utils import get_readonly_context
 
 logger = logging.getLogger(__name__)
-user_manager = UserManager()
-agraph_manager = AgraphManager()
+
+
+# Card sections of the profile page that are paginated, mapped to their key in the profile context
+PROFILE_CARD_SECTIONS = {
+    "activities": "activity_log",
+    "created_cards": "created_cards",
+    "tagged_in_cards": "tagged_in_cards",
+}
 
 
 @login_required(login_url="/accounts/login/")
 def profile(request, user_id: int):
-    django_user = User.objects.get(id=user_id)
-    context = _get_user_context(
-        django_id=user_id,
-        graph_id=str(django_user.profile.graph_id)
-    )
-    return render(request, "profile.html", context)
+    django_user = _get_user_with_profile(user_id)
+
+    # Revalidation only needs the profile row, so it is answered before any graph query
+    etag, last_modified = _get_profile_validators(request, django_user)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        context = _get_cached_user_context(django_user)
+        response = render(request, "profile.html", {**context, **_get_first_pages(context)})
+
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    return response
+
+
+@login_required(login_url="/accounts/login/")
+def profile_section(request, user_id: int, section: str):
+    """Render the page of a profile card section that follows the card given as ``cursor``.
+
+    In sections grouped by type, the cards of the page that share the type of the cursor card are appended to the
+    group already on the page (``continued_type``) instead of opening a second group with the same heading.
+    """
+    if section not in PROFILE_CARD_SECTIONS:
+        raise Http404("Section not found")
+
+    context = _get_cached_user_context(_get_user_with_profile(user_id))
+    section_cards = _get_section_cards(context, section)
+    cursor = request.GET.get("cursor")
+    cards, next_cursor = _paginate_cards(section_cards, cursor, settings.PROFILE_SECTION_PAGE_SIZE)
+    grouped = isinstance(context[PROFILE_CARD_SECTIONS[section]], dict)
+    return render(request, "includes/profile_cards_page.html", {
+        "user_id": user_id,
+        "section": section,
+        "grouped": grouped,
+        "continued_type": next((card.type for card in section_cards if card.id == cursor), None) if grouped else None,
+        "cards": cards,
+        "next_cursor": next_cursor,
+    })
 
 
 @login_required(login_url="/accounts/login/")
 def fetch_card_data_for_user(request, card_id: str, user_id: int):
+    fragment = get_or_render_card_fragment(card_id, partial(_render_card_fragment, card_id))
+    return _card_fragment_response(request, fragment)
+
+
+async def profile_async(request, user_id: int):
+    """Async variant of ``profile`` for ASGI deployments.
+
+    Graph queries run on threads outside of the single sync thread shared by the ORM, so a worker can hold many
+    profile requests in flight while waiting on AllegroGraph. Everything that touches the database, the caches
+    included, stays on that sync thread.
+    """
+    if not await _is_authenticated(request):
+        return redirect_to_login(request.get_full_path(), login_url="/accounts/login/")
+
+    try:
+        django_user = await User.objects.select_related("profile").aget(id=user_id)
+    except User.DoesNotExist:
+        raise Http404("User not found")
+
+    async def build() -> Dict[str, Any]:
+        graph_queries = _get_graph_queries(str(django_user.profile.graph_id))
+        results = await asyncio.wait_for(
+            asyncio.gather(*(sync_to_async(call, thread_sensitive=False)() for call in graph_queries.values())),
+            timeout=settings.GRAPH_QUERY_TIMEOUT,
+        )
+        graph_data = dict(zip(graph_queries.keys(), results))
+        # Tagger details are read from the shared cache, which may be backed by the database
+        return await sync_to_async(_build_user_context)(django_user, graph_data)
+
+    # request.user was resolved by _is_authenticated and the profile row was loaded along with the user, so computing
+    # the validators does not touch the database
+    etag, last_modified = _get_profile_validators(request, django_user)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        context = await aget_or_build_profile_context(str(django_user.profile.graph_id), build)
+        response = await sync_to_async(render)(request, "profile.html", {**context, **_get_first_pages(context)})
+
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    return response
+
+
+async def fetch_card_data_for_user_async(request, card_id: str, user_id: int):
+    """Async variant of ``fetch_card_data_for_user`` for ASGI deployments."""
+    if not await _is_authenticated(request):
+        return redirect_to_login(request.get_full_path(), login_url="/accounts/login/")
+
+    async def render() -> str:
+        card = await sync_to_async(_get_card, thread_sensitive=False)(card_id)
+        return await sync_to_async(_render_card)(card)
+
+    fragment = await aget_or_render_card_fragment(card_id, render)
+    return _card_fragment_response(request, fragment)
+
+
+async def _is_authenticated(request) -> bool:
+    return await sync_to_async(lambda: request.user.is_authenticated)()
+
+
+def _render_card_fragment(card_id: str) -> str:
+    return _render_card(_get_card(card_id))
+
+
+def _get_card(card_id: str) -> InstanceWithLabel:
     card = agraph_manager.get_card_details(card_id=decode_uri(card_id))
     if not card:
         raise Http404("Card not found")
+    return card
 
+
+def _render_card(card: InstanceWithLabel) -> str:
     template = card_constants.CARD_TYPE_READONLY_TEMPLATE_MAPPING.get(card.card_type)
     if not template:
         raise Http404("Template not found")
 
+    # Rendered without the request so the fragment can be shared between viewers
     context = get_card_context(card, user_manager, agraph_manager)
-    return render(request, template, context=get_readonly_context(context))
+    return render_to_string(template, context=get_readonly_context(context))
+
 
+def _card_fragment_response(request, fragment: CardFragment) -> HttpResponse:
+    response = get_conditional_response(request, etag=fragment.etag)
+    if response is None:
+        response = HttpResponse(fragment.html)
+    response["ETag"] = fragment.etag
+    return response
 
-def _get_user_context(django_id: int, graph_id: str):
+
+def _get_user_with_profile(user_id: int) -> User:
+    # A single query serves the whole profile path, profile included
     try:
-        django_user = User.objects.get(id=django_id)
+        return User.objects.select_related("profile").get(id=user_id)
     except User.DoesNotExist:
         raise Http404("User not found")
 
-    contributions = user_manager.get_user_contributions(graph_id)
-    for c in contributions:
-        c.id = encode_uri(c.id)
-    tagged_in_cards = _get_tagged_in_cards(contributions)
-    taggers = _get_taggers(contributions)
 
-    # We only want to show public cards
-    activities = [a for a in user_manager.get_user_activities(graph_id) if a.is_public == "yes"]
-    for a in activities:
-        a.id = encode_uri(a.id)
+def _get_cached_user_context(django_user: User) -> Dict[str, Any]:
+    return get_or_build_profile_context(
+        str(django_user.profile.graph_id),
+        lambda: _get_user_context(django_user),
+    )
+
+
+def _get_profile_validators(request, django_user: User) -> tuple[str, int]:
+    """Return the ETag and last modification timestamp of a profile page.
+
+    The page changes when the profile is saved or the user's graph data is written (``Profile.graph_updated_at``). It
+    also embeds the viewer in the page layout, so the viewer is part of the ETag.
+    """
+    profile = django_user.profile
+    profile_updated_at = profile.updated_at.timestamp()
+    graph_updated_at = profile.graph_updated_at.timestamp() if profile.graph_updated_at else 0.0
+    validator = f"{django_user.id}:{profile_updated_at}:{graph_updated_at}:{request.user.pk}"
+    etag = f'W/"{hashlib.md5(validator.encode()).hexdigest()}"'
+    return etag, int(max(profile_updated_at, graph_updated_at))
+
+
+def _get_user_context(django_user: User) -> Dict[str, Any]:
+    # These queries are independent, so they run concurrently
+    graph_data = run_concurrently(_get_graph_queries(str(django_user.profile.graph_id)))
+    return _build_user_context(django_user, graph_data)
+
+
+def _get_graph_queries(graph_id: str) -> Dict[str, Callable[[], list[InstanceWithLabel]]]:
+    return {
+        "contributions": partial(user_manager.get_user_contributions, graph_id),
+        "activities": partial(user_manager.get_user_activities, graph_id),
+        "creations": partial(user_manager.get_user_creations, graph_id),
+    }
+
 
-    created_cards = _get_user_creations(graph_id)
+def _build_user_context(django_user: User, graph_data: Dict[str, Any]) -> Dict[str, Any]:
+    contributions = _partition_cards(graph_data["contributions"], by_creator=True)
+    tagged_in_cards = contributions.by_type
+    taggers = _get_taggers(contributions.by_creator)
+    created_cards = _partition_cards(graph_data["creations"]).by_type
+
+    # We only want to show public cards
+    activities = []
+    for a in graph_data["activities"]:
+        if a.is_public == "yes":
+            a.id = encode_uri(a.id)
+            activities.append(a)
 
     profile_data = django_user.profile.pretty_printed_user_info or {}
     context: Dict[str, Any] = {
         "segment": "profile",
         "profile_unclaimed": profile_data == {},
-        "user_id": django_id,
+        "user_id": django_user.id,
         "name": profile_data.get(constants.PF_NAME),
         "job_title": profile_data.get(constants.PF_JOB_TITLE),
         "employer": profile_data.get(constants.PF_EMPLOYER),
@@ -91,7 +262,7 @@ def _get_user_context(django_id: int, graph_id: str):
         "groups": profile_data.get(constants.PF_GROUPS),
         "skillset": profile_data.get(constants.PF_SKILLSET),
         "lab_group": profile_data.get(constants.PF_COLLABORATORS),
-        "user_contributions": _get_chart_pie_data(created_cards),
+        "user_contributions": _get_chart_pie_data(_get_contribution_counts(django_user, created_cards)),
         "taggers": taggers,
         "activity_log": activities,
         "created_cards": created_cards,
@@ -102,67 +273,93 @@ def _get_user_context(django_id: int, graph_id: str):
     return context
 
 
-def _get_user_creations(user_id: str) -> dict[str, list[InstanceWithLabel]]:
-    cards = user_manager.get_user_creations(user_id)
-    for c in cards:
-        c.id = encode_uri(c.id)
-
-    cards_by_type: dict[str, list[InstanceWithLabel]] = dict()
-    for card in cards:
-        # We only want to show public, non-stub cards
-        if card.is_public != "yes" or card.is_stub == "yes":
-            continue
-
-        assert card.type is not None
-        if card.type not in cards_by_type.keys():
-            cards_by_type[card.type] = [card]
-        else:
-            cards_by_type[card.type].append(card)
+@dataclass
+class CardPartition:
+    by_type: dict[str, list[InstanceWithLabel]] = field(default_factory=dict)
+    by_creator: dict[str, list[InstanceWithLabel]] = field(default_factory=dict)
 
-    return cards_by_type
 
+def _partition_cards(cards: Iterable[InstanceWithLabel], by_creator: bool = False) -> CardPartition:
+    """Group the public, non-stub cards by type and, optionally, by creator label in a single pass.
 
-def _get_tagged_in_cards(cards: list[InstanceWithLabel]) -> dict[str, list[InstanceWithLabel]]:
-    cards_by_type: dict[str, list[InstanceWithLabel]] = dict()
+    The ids of the kept cards are encoded along the way so the template can use them in URLs.
+    """
+    partition = CardPartition()
     for card in cards:
         # We only want to show public, non-stub cards
         if card.is_public != "yes" or card.is_stub == "yes":
             continue
 
+        card.id = encode_uri(card.id)
         assert card.type is not None
-        if card.type not in cards_by_type.keys():
-            cards_by_type[card.type] = [card]
-        else:
-            cards_by_type[card.type].append(card)
+        partition.by_type.setdefault(card.type, []).append(card)
 
-    return cards_by_type
+        if by_creator:
+            assert card.created_by is not None
+            partition.by_creator.setdefault(get_label_from_uri(card.created_by), []).append(card)
 
+    return partition
 
-def _get_taggers(cards: list[InstanceWithLabel]) -> dict[tuple[str, str], list[InstanceWithLabel]]:
-    cards_by_tagger: dict[str, list[InstanceWithLabel]] = dict()
-    for card in cards:
-        # We only want to show public, non-stub cards
-        if card.is_public != "yes" or card.is_stub == "yes":
-            continue
-
-        assert card.created_by is not None
-        creator = get_label_from_uri(card.created_by)
-        if creator not in cards_by_tagger.keys():
-            cards_by_tagger[creator] = [card]
-        else:
-            cards_by_tagger[creator].append(card)
 
+def _get_taggers(
+    cards_by_tagger: dict[str, list[InstanceWithLabel]]
+) -> dict[tuple[str, str], list[InstanceWithLabel]]:
+    taggers_details = get_users_details(cards_by_tagger.keys(), user_manager)
     taggers_info: dict[tuple[str, str], list[InstanceWithLabel]] = {}
     for tagger, cards in cards_by_tagger.items():
-        tagger_details = user_manager.get_user_details(tagger)
+        tagger_details = taggers_details[tagger]
         taggers_info[(tagger_details.email, tagger_details.django_id)] = cards
 
     return taggers_info
 
 
-def _get_chart_pie_data(cards: dict[str, list[InstanceWithLabel]]) -> str:
-    total = sum(len(v) for v in cards.values())
-    return json.dumps({k: round((len(v) / total) * 100) for k, v in cards.items()})
+def _get_section_cards(context: Dict[str, Any], section: str) -> list[InstanceWithLabel]:
+    cards = context[PROFILE_CARD_SECTIONS[section]]
+    if isinstance(cards, dict):
+        # Flatten cards grouped by type, keeping each type contiguous so pages can be regrouped in the template
+        return [card for cards_of_type in cards.values() for card in cards_of_type]
+    return cards
+
+
+def _paginate_cards(
+    cards: list[InstanceWithLabel], cursor: Optional[str], page_size: int
+) -> tuple[list[InstanceWithLabel], Optional[str]]:
+    """Return the page of cards following the card whose id is ``cursor``, and the cursor of the next page."""
+    start = 0
+    if cursor:
+        position = next((i for i, card in enumerate(cards) if card.id == cursor), None)
+        if position is None:
+            raise Http404("Cursor not found")
+        start = position + 1
+
+    page = cards[start:start + page_size]
+    next_cursor = page[-1].id if start + page_size < len(cards) else None
+    return page, next_cursor
+
+
+def _get_first_pages(context: Dict[str, Any]) -> Dict[str, Any]:
+    pages: Dict[str, Any] = {}
+    for section in PROFILE_CARD_SECTIONS:
+        cards, next_cursor = _paginate_cards(
+            _get_section_cards(context, section), None, settings.PROFILE_SECTION_PAGE_SIZE
+        )
+        pages[f"{section}_page"] = cards
+        pages[f"{section}_next_cursor"] = next_cursor
+    return pages
+
+
+def _get_contribution_counts(django_user: User, created_cards: dict[str, list[InstanceWithLabel]]) -> dict[str, int]:
+    # Profiles whose counts have not been materialized yet fall back to counting the fetched cards
+    if django_user.profile.contribution_counts is not None:
+        return django_user.profile.contribution_counts
+    return {card_type: len(cards) for card_type, cards in created_cards.items()}
+
+
+def _get_chart_pie_data(counts: dict[str, int]) -> str:
+    total = sum(counts.values())
+    if not total:
+        return json.dumps({})
+    return json.dumps({k: round((v / total) * 100) for k, v in counts.items() if v})
 
 
 def _get_at_a_glance(data: dict[str, Any]) -> Optional[str]:
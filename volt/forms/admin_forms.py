@@ -1,7 +1,10 @@
 from django import forms
 
+# Codes are generated in bulk, the bound keeps a single request from holding a worker for too long
+MAX_INVITE_CODES = 100_000
+
 
 class GenerateInviteCodesForm(forms.Form):
     source_event = forms.CharField(label="Source Event", required=False, max_length=500)
-    num_codes = forms.IntegerField(label="Number of Codes", min_value=1)
+    num_codes = forms.IntegerField(label="Number of Codes", min_value=1, max_value=MAX_INVITE_CODES)
     expires_at = forms.DateTimeField(label="Expiration Date", required=False, widget=forms.DateTimeInput(attrs={'type': 'datetime-local'}))
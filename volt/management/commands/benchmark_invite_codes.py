@@ -0,0 +1,52 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.db import transaction
+from django.utils.crypto import get_random_string
+
+from volt.models import INVITE_CODE_LENGTH
+from volt.models import InviteCode
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Measure invite code generation in bulk against one INSERT per code. Nothing is kept in the database"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--codes", type=int, default=100_000, help="Number of codes generated in bulk")
+        parser.add_argument("--one-by-one-codes", type=int, default=1000, help="Number of codes created one by one")
+
+    def handle(self, *args, **options):
+        admin = User.objects.filter(is_superuser=True).first()
+        if admin is None:
+            raise CommandError("Create a superuser first, invite codes need a creator")
+
+        bulk = self._codes_per_second(
+            options["codes"], lambda: InviteCode.objects.generate(options["codes"], created_by=admin)
+        )
+        one_by_one = self._codes_per_second(
+            options["one_by_one_codes"],
+            lambda: [
+                InviteCode.objects.create(created_by=admin, code=get_random_string(INVITE_CODE_LENGTH))
+                for _ in range(options["one_by_one_codes"])
+            ],
+        )
+        self.stdout.write(f"bulk: {bulk:,.0f} codes/s ({options['codes'] / bulk:.2f}s for {options['codes']:,} codes)")
+        self.stdout.write(f"one by one: {one_by_one:,.0f} codes/s ({bulk / one_by_one:.1f}x slower)")
+
+    @staticmethod
+    def _codes_per_second(num_codes, generate) -> float:
+        start = time.perf_counter()
+        try:
+            with transaction.atomic():
+                generate()
+                elapsed = time.perf_counter() - start
+                raise Rollback
+        except Rollback:
+            pass
+        return num_codes / elapsed
@@ -0,0 +1,131 @@
+import logging
+import time
+from concurrent.futures import wait
+from datetime import timedelta
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from home.agraph.agraph_models import GraphUser
+from home.agraph_clients import user_manager
+from home.cache.profile_cache import mark_graphs_changed
+from home.executors import graph_query_executor
+from volt.models import GraphUserOutbox
+
+GraphError = Optional[BaseException]
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Create in AllegroGraph the users queued in the graph outbox by registrations"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100, help="Entries claimed at once")
+        parser.add_argument("--max-attempts", type=int, default=5, help="Attempts before an entry is left aside")
+        parser.add_argument(
+            "--lease",
+            type=float,
+            default=60.0,
+            help="Seconds a claimed entry is reserved to this worker, at least twice GRAPH_QUERY_TIMEOUT",
+        )
+        parser.add_argument("--loop", action="store_true", help="Keep polling for new entries instead of exiting")
+        parser.add_argument("--interval", type=float, default=5.0, help="Seconds between polls with --loop")
+
+    def handle(self, *args, **options):
+        # A batch may take two graph calls, the batched one and the one-by-one retry of its entries
+        lease = max(options["lease"], 2 * settings.GRAPH_QUERY_TIMEOUT)
+        while True:
+            # Walk the outbox once per pass, so failed entries are retried on the next pass rather than right away
+            processed = failed = last_id = 0
+            while last_id is not None:
+                batch_processed, batch_failed, last_id = self.drain_batch(
+                    options["batch_size"], options["max_attempts"], last_id, lease
+                )
+                processed += batch_processed
+                failed += batch_failed
+
+            if processed or failed:
+                self.stdout.write(self.style.SUCCESS(f"Created {processed} graph users, {failed} failed"))
+            if not options["loop"]:
+                return
+            time.sleep(options["interval"])
+
+    def drain_batch(self, batch_size: int, max_attempts: int, after_id: int, lease: float = 60.0):
+        """Claim a batch of pending entries and create their graph users with one batched call.
+
+        No transaction is open while waiting on the graph. Entries are claimed in a short transaction that locks them
+        with ``SKIP LOCKED`` and leases them for ``lease`` seconds, so other workers skip them. The graph users are then
+        created, see ``create_graph_users``, and the outcomes are recorded in a second short transaction. Failed entries
+        are released for later passes until they reach ``max_attempts``. Entries whose call timed out keep their lease,
+        since the call may still complete, and are retried once it expires.
+
+        Returns:
+            Tuple[int, int, Optional[int]]: The number of processed and failed entries, and the id to resume the pass
+            after, or None once the pass is over.
+        """
+        with transaction.atomic():
+            entries = list(
+                GraphUserOutbox.objects.pending(max_attempts)
+                .filter(id__gt=after_id)
+                .select_for_update(skip_locked=True)
+                .order_by("id")[:batch_size]
+            )
+            if not entries:
+                return 0, 0, None
+            claimed_until = timezone.now() + timedelta(seconds=lease)
+            GraphUserOutbox.objects.filter(pk__in=[entry.pk for entry in entries]).update(claimed_until=claimed_until)
+
+        errors, timed_out = self.create_graph_users([GraphUser(**entry.payload) for entry in entries])
+
+        now = timezone.now()
+        for entry, error, entry_timed_out in zip(entries, errors, timed_out):
+            entry.claimed_until = claimed_until if entry_timed_out else None
+            if error is None:
+                entry.processed_at = now
+            else:
+                logger.error(f"Could not create graph user {entry.payload.get('user_id')}: {error}")
+                entry.attempts += 1
+                entry.last_error = str(error)
+            entry.updated_at = now
+        GraphUserOutbox.objects.bulk_update(
+            entries, ["processed_at", "attempts", "last_error", "claimed_until", "updated_at"]
+        )
+
+        processed = [entry for entry in entries if entry.processed_at]
+        mark_graphs_changed([entry.payload["user_id"] for entry in processed])
+        return len(processed), len(entries) - len(processed), entries[-1].id
+
+    def create_graph_users(self, users: list) -> Tuple[List[GraphError], List[bool]]:
+        """Create graph users with a single ``create_users`` call, each with its own call if the batched one fails.
+
+        The one-by-one retry keeps a single bad entry from failing every entry of its batch.
+
+        Returns:
+            Tuple[List[Optional[BaseException]], List[bool]]: The error of each user, None once created, and whether
+            its call timed out.
+        """
+        errors, timed_out = self.wait_for_graph([graph_query_executor.submit(user_manager.create_users, users)])
+        if errors[0] is None or timed_out[0] or len(users) == 1:
+            return errors * len(users), timed_out * len(users)
+
+        logger.warning(f"Could not create {len(users)} graph users at once, creating them one by one: {errors[0]}")
+        return self.wait_for_graph([graph_query_executor.submit(user_manager.create_user, user) for user in users])
+
+    @staticmethod
+    def wait_for_graph(futures: list) -> Tuple[List[GraphError], List[bool]]:
+        """Wait up to ``GRAPH_QUERY_TIMEOUT`` for graph calls, and return their errors and whether they timed out."""
+        done, _ = wait(futures, timeout=settings.GRAPH_QUERY_TIMEOUT)
+        errors: List[GraphError] = []
+        for future in futures:
+            if future in done:
+                errors.append(future.exception())
+            else:
+                future.cancel()
+                errors.append(TimeoutError(f"No answer within {settings.GRAPH_QUERY_TIMEOUT}s"))
+        return errors, [future not in done for future in futures]
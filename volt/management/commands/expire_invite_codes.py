@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from volt.models import InviteCode
+
+
+class Command(BaseCommand):
+    help = "Deactivate the invite codes whose expiration date has passed. Meant to run periodically, e.g. from cron"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Codes deactivated per UPDATE")
+
+    def handle(self, *args, **options):
+        deactivated = InviteCode.objects.deactivate_expired(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Deactivated {deactivated} expired invite codes"))
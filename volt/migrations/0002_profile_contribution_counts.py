@@ -0,0 +1,18 @@
+# Generated by Django 4.1.12 on 2026-10-18 09:12
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volt', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='contribution_counts',
+            field=models.JSONField(blank=True, help_text='Number of public, non-stub cards created by the user, by card type', null=True),
+        ),
+    ]
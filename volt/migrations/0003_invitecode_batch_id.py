@@ -0,0 +1,18 @@
+# Generated by Django 4.1.12 on 2026-10-18 14:05
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volt', '0002_profile_contribution_counts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='invitecode',
+            name='batch_id',
+            field=models.UUIDField(blank=True, db_index=True, editable=False, help_text='Identifier of the bulk generation that created the code', null=True),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.1.12 on 2026-10-18 16:40
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volt', '0003_invitecode_batch_id'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='invitecode',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['code'], name='invitecode_active_code_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='invitecode',
+            index=models.Index(fields=['is_active', 'expires_at'], name='invitecode_active_expires_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.1.12 on 2026-10-18 18:15
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volt', '0004_invitecode_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GraphUserOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('payload', models.JSONField(help_text='Fields of the GraphUser to create')),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True, default='')),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('processed_at__isnull', True)), fields=['id'], name='graphuseroutbox_pending_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.1.12 on 2026-10-18 21:40
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volt', '0005_graphuseroutbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='graph_updated_at',
+            field=models.DateTimeField(blank=True, help_text="Last write of the user's data in AllegroGraph, answers conditional requests to the profile page", null=True),
+        ),
+    ]
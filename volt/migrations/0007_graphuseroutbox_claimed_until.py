@@ -0,0 +1,18 @@
+# Generated by Django 4.1.12 on 2026-10-18 22:05
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volt', '0006_profile_graph_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='graphuseroutbox',
+            name='claimed_until',
+            field=models.DateTimeField(blank=True, help_text='End of the lease of the worker creating the graph user', null=True),
+        ),
+    ]
@@ -1,12 +1,19 @@
 import logging
 import uuid
+from datetime import datetime
+from typing import List
+from typing import Optional
 
 from django.contrib.auth.models import User
 from django.db import models
+from django.db import transaction
 from django.db.models.signals import post_save
 from django.dispatch import receiver
+from django.utils import timezone
 from django.utils.crypto import get_random_string
 
+INVITE_CODE_LENGTH = 15
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,18 +30,132 @@ class Profile(models.Model):
     user_info = models.JSONField(null=True, blank=True)
     pretty_printed_user_info = models.JSONField(null=True, blank=True)
     stub_cards = models.JSONField(null=True, blank=True)
+    contribution_counts = models.JSONField(
+        null=True,
+        blank=True,
+        help_text="Number of public, non-stub cards created by the user, by card type",
+    )
+    graph_updated_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Last write of the user's data in AllegroGraph, answers conditional requests to the profile page",
+    )
+
+    def record_contribution(self, card_type: str, delta: int = 1) -> None:
+        """Update the number of cards of a type created by the user.
+
+        Call it with a positive delta when the user creates a public, non-stub card and a negative one when such a
+        card is deleted or stops being public. The row is locked so concurrent updates are not lost.
+
+        Profiles whose counts were never materialized are left untouched: starting them from zero would hide their
+        older cards, and the profile page counts the fetched cards for them until ``backfill_contribution_counts``
+        fills them.
+        """
+        with transaction.atomic():
+            profile = Profile.objects.select_for_update().get(pk=self.pk)
+            if profile.contribution_counts is None:
+                return
+            counts = profile.contribution_counts
+            counts[card_type] = max(0, counts.get(card_type, 0) + delta)
+            if not counts[card_type]:
+                del counts[card_type]
+            profile.contribution_counts = counts
+            profile.save(update_fields=["contribution_counts", "updated_at"])
+        self.contribution_counts = counts
 
 
 @receiver(post_save, sender=User)
 def update_user_profile(sender, instance, created, **kwargs):
-    """Create a profile for a user if it does not exist."""
-    profile_exists = Profile.objects.filter(user=instance).exists()
-    if created and not profile_exists:
+    """Create the profile of a new user, and save the profile of an existing user along with it.
+
+    Existing users are saved on every login (``last_login``), so the profile is only saved when it was loaded on the
+    instance, i.e. when the caller may have changed it. Otherwise saving a user runs no profile query at all.
+    """
+    if created:
         Profile.objects.create(user=instance)
-    else:
+    elif User.profile.related.is_cached(instance):
         instance.profile.save()
 
 
+class InviteCodeQuerySet(models.QuerySet):
+    def generate(
+        self,
+        num_codes: int,
+        created_by: User,
+        source_event: Optional[str] = None,
+        expires_at: Optional[datetime] = None,
+        batch_size: int = 1000,
+    ) -> List["InviteCode"]:
+        """Create many invite codes with a handful of queries.
+
+        Codes are drawn in memory and checked against the existing ones with a single query. Only the ones that
+        collide are drawn again, then all of them are inserted with ``bulk_create`` in batches of ``batch_size``, in
+        one transaction. The codes share a ``batch_id``, so the batch can be exported later.
+
+        Returns:
+            List[InviteCode]: The created invite codes.
+        """
+        batch_id = uuid.uuid4()
+        with transaction.atomic():
+            codes: set[str] = set()
+            while len(codes) < num_codes:
+                candidates = {get_random_string(INVITE_CODE_LENGTH) for _ in range(num_codes - len(codes))} - codes
+                existing = set(self.filter(code__in=candidates).values_list("code", flat=True))
+                codes |= candidates - existing
+
+            return self.bulk_create(
+                [
+                    InviteCode(
+                        code=code,
+                        created_by=created_by,
+                        source_event=source_event,
+                        expires_at=expires_at,
+                        batch_id=batch_id,
+                    )
+                    for code in codes
+                ],
+                batch_size=batch_size,
+            )
+
+    def usable(self) -> "InviteCodeQuerySet":
+        """Filter the codes that can still be redeemed: active, unused and not expired."""
+        return self.filter(
+            models.Q(expires_at__isnull=True) | models.Q(expires_at__gt=timezone.now()),
+            is_active=True,
+            used_by__isnull=True,
+        )
+
+    def redeem(self, code: str, user: User) -> bool:
+        """Consume an invite code for a user, if it is active, unused and not expired.
+
+        Validation and consumption are a single conditional UPDATE, so two concurrent signups can never both redeem
+        the same code.
+
+        Returns:
+            bool: True if the code was redeemed, False if it does not exist or can no longer be used.
+        """
+        redeemed = self.usable().filter(code=code).update(is_active=False, used_by=user, updated_at=timezone.now())
+        return redeemed == 1
+
+    def deactivate_expired(self, batch_size: int = 1000) -> int:
+        """Deactivate the active codes whose expiration date has passed, in batches.
+
+        Each batch is its own short UPDATE, so rows are never locked for long even when millions of codes expire.
+
+        Returns:
+            int: The number of deactivated codes.
+        """
+        now = timezone.now()
+        deactivated = 0
+        while True:
+            batch = list(
+                self.filter(is_active=True, expires_at__lte=now).values_list("pk", flat=True)[:batch_size]
+            )
+            if not batch:
+                return deactivated
+            deactivated += self.filter(pk__in=batch, is_active=True).update(is_active=False, updated_at=now)
+
+
 class InviteCode(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -42,6 +163,13 @@ class InviteCode(models.Model):
     is_active = models.BooleanField(default=True)
     expires_at = models.DateTimeField(null=True, blank=True)
     source_event = models.CharField(max_length=500, null=True, blank=True)
+    batch_id = models.UUIDField(
+        null=True,
+        blank=True,
+        editable=False,
+        db_index=True,
+        help_text="Identifier of the bulk generation that created the code",
+    )
     created_by = models.ForeignKey(
         'auth.User',
         on_delete=models.CASCADE,
@@ -55,9 +183,18 @@ class InviteCode(models.Model):
         related_name='used_invite_codes'
     )
 
+    objects = InviteCodeQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Redemption only looks up active codes
+            models.Index(fields=["code"], condition=models.Q(is_active=True), name="invitecode_active_code_idx"),
+            models.Index(fields=["is_active", "expires_at"], name="invitecode_active_expires_idx"),
+        ]
+
     def save(self, *args, **kwargs):
         if not self.code:
-            self.code = get_random_string(15)
+            self.code = get_random_string(INVITE_CODE_LENGTH)
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -66,3 +203,45 @@ class InviteCode(models.Model):
     def deactivate(self):
         self.is_active = False
         self.save()
+
+
+class GraphUserOutboxQuerySet(models.QuerySet):
+    def pending(self, max_attempts: int):
+        """Entries not written to the graph yet, that have not exhausted their attempts and are not claimed."""
+        return self.filter(
+            models.Q(claimed_until__isnull=True) | models.Q(claimed_until__lte=timezone.now()),
+            processed_at__isnull=True,
+            attempts__lt=max_attempts,
+        )
+
+
+class GraphUserOutbox(models.Model):
+    """Graph user waiting to be created in AllegroGraph.
+
+    Entries are written in the same transaction as the Django user, so a signup never waits on the graph, and are
+    drained in batches by the ``drain_graph_outbox`` command.
+    """
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    payload = models.JSONField(help_text="Fields of the GraphUser to create")
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default="")
+    processed_at = models.DateTimeField(null=True, blank=True)
+    claimed_until = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="End of the lease of the worker creating the graph user",
+    )
+
+    objects = GraphUserOutboxQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["id"], condition=models.Q(processed_at__isnull=True), name="graphuseroutbox_pending_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.payload.get('email')} - {'Processed' if self.processed_at else 'Pending'}"
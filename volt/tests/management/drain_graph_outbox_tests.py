@@ -0,0 +1,96 @@
+import threading
+from datetime import timedelta
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.test import TransactionTestCase
+from django.utils import timezone
+
+from volt.models import GraphUserOutbox
+
+
+@mock.patch("volt.management.commands.drain_graph_outbox.mark_graphs_changed")
+@mock.patch("volt.management.commands.drain_graph_outbox.GraphUser", side_effect=lambda **kwargs: kwargs)
+@mock.patch("volt.management.commands.drain_graph_outbox.user_manager")
+class DrainGraphOutboxTests(TransactionTestCase):
+    def setUp(self):
+        self.entries = [
+            GraphUserOutbox.objects.create(payload={"user_id": f"graph-{i}", "django_id": str(i), "email": f"{i}@a.b"})
+            for i in range(3)
+        ]
+
+    def test_entries_are_processed(self, user_manager, graph_user, mark_graphs_changed):
+        """Test that pending entries create their graph users with one call per batch and are marked as processed."""
+        call_command("drain_graph_outbox", "--batch-size", "2", stdout=mock.MagicMock())
+
+        batches = [[user["user_id"] for user in call.args[0]] for call in user_manager.create_users.call_args_list]
+        self.assertEqual(batches, [["graph-0", "graph-1"], ["graph-2"]])
+        user_manager.create_user.assert_not_called()
+        self.assertFalse(GraphUserOutbox.objects.filter(processed_at__isnull=True).exists())
+        mark_graphs_changed.assert_called_with(["graph-2"])
+
+    def test_failed_entries_are_retried_until_max_attempts(self, user_manager, graph_user, mark_graphs_changed):
+        """Test that a failing entry records its error, is retried by later runs and then left aside."""
+        user_manager.create_users.side_effect = lambda users: [self._fail_for(user, "graph-1") for user in users]
+        user_manager.create_user.side_effect = lambda user: self._fail_for(user, "graph-1")
+
+        for _ in range(3):
+            call_command("drain_graph_outbox", "--max-attempts", "2", stdout=mock.MagicMock())
+
+        failed = GraphUserOutbox.objects.get(pk=self.entries[1].pk)
+        self.assertIsNone(failed.processed_at)
+        self.assertEqual(failed.attempts, 2)
+        self.assertEqual(failed.last_error, "graph unavailable")
+        self.assertEqual(GraphUserOutbox.objects.filter(processed_at__isnull=False).count(), 2)
+
+    def test_claimed_entries_are_skipped_until_their_lease_expires(self, user_manager, graph_user, mark_graphs_changed):
+        """Test that an entry leased by another worker is left alone until the lease runs out."""
+        GraphUserOutbox.objects.filter(pk=self.entries[0].pk).update(
+            claimed_until=timezone.now() + timedelta(minutes=1)
+        )
+        GraphUserOutbox.objects.filter(pk=self.entries[1].pk).update(
+            claimed_until=timezone.now() - timedelta(minutes=1)
+        )
+
+        call_command("drain_graph_outbox", stdout=mock.MagicMock())
+
+        self.assertEqual(len(user_manager.create_users.call_args.args[0]), 2)
+        self.assertIsNone(GraphUserOutbox.objects.get(pk=self.entries[0].pk).processed_at)
+        released = GraphUserOutbox.objects.get(pk=self.entries[1].pk)
+        self.assertIsNotNone(released.processed_at)
+        self.assertIsNone(released.claimed_until)
+
+    @override_settings(GRAPH_QUERY_TIMEOUT=0.05)
+    def test_timed_out_entries_keep_their_lease(self, user_manager, graph_user, mark_graphs_changed):
+        """Test that an entry whose graph call does not answer in time is failed but stays claimed."""
+        release = threading.Event()
+        self.addCleanup(release.set)
+        user_manager.create_users.side_effect = ConnectionError("graph unavailable")
+        user_manager.create_user.side_effect = lambda user: user["user_id"] == "graph-1" and release.wait(5)
+
+        call_command("drain_graph_outbox", stdout=mock.MagicMock())
+
+        timed_out = GraphUserOutbox.objects.get(pk=self.entries[1].pk)
+        self.assertIsNone(timed_out.processed_at)
+        self.assertEqual(timed_out.attempts, 1)
+        self.assertIn("No answer", timed_out.last_error)
+        self.assertGreater(timed_out.claimed_until, timezone.now())
+        self.assertEqual(GraphUserOutbox.objects.filter(processed_at__isnull=False).count(), 2)
+
+    @override_settings(GRAPH_QUERY_TIMEOUT=0.05)
+    def test_timed_out_batch_keeps_its_lease(self, user_manager, graph_user, mark_graphs_changed):
+        """Test that the entries of a batched call that does not answer in time are not retried one by one."""
+        release = threading.Event()
+        self.addCleanup(release.set)
+        user_manager.create_users.side_effect = lambda users: release.wait(5)
+
+        call_command("drain_graph_outbox", stdout=mock.MagicMock())
+
+        user_manager.create_user.assert_not_called()
+        self.assertEqual(GraphUserOutbox.objects.filter(attempts=1, claimed_until__gt=timezone.now()).count(), 3)
+
+    @staticmethod
+    def _fail_for(user, user_id):
+        if user["user_id"] == user_id:
+            raise ConnectionError("graph unavailable")
@@ -0,0 +1,77 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+
+from volt.models import InviteCode
+
+
+class GenerateInviteCodesTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username="admin", password="supersecret")
+
+    def test_codes_are_created(self):
+        """Test that the requested number of distinct codes is created with the given attributes."""
+        codes = InviteCode.objects.generate(50, created_by=self.admin, source_event="Conference", batch_size=20)
+
+        self.assertEqual(len({code.code for code in codes}), 50)
+        self.assertEqual(InviteCode.objects.filter(source_event="Conference", created_by=self.admin).count(), 50)
+
+    def test_queries_do_not_grow_with_codes(self):
+        """Test that codes are checked with one query and inserted in batches."""
+        # Savepoint, existing codes, two INSERTs, savepoint release
+        with self.assertNumQueries(5):
+            InviteCode.objects.generate(200, created_by=self.admin, batch_size=100)
+
+    def test_only_collided_codes_are_drawn_again(self):
+        """Test that codes which already exist are replaced by new ones."""
+        InviteCode.objects.create(created_by=self.admin, code="existing")
+        with mock.patch("volt.models.get_random_string", side_effect=["existing", "new-1", "new-2"]) as draw:
+            codes = InviteCode.objects.generate(2, created_by=self.admin)
+
+        self.assertEqual(draw.call_count, 3)
+        self.assertSetEqual({code.code for code in codes}, {"new-1", "new-2"})
+
+
+class RedeemInviteCodeTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username="admin", password="supersecret")
+        self.user = User.objects.create_user(username="newuser", password="supersecret")
+        self.invite_code = InviteCode.objects.create(created_by=self.admin)
+
+    def test_code_is_redeemed_once(self):
+        """Test that a code is consumed by its first redemption and rejected afterwards."""
+        with self.assertNumQueries(1):
+            self.assertTrue(InviteCode.objects.redeem(self.invite_code.code, self.user))
+        self.assertFalse(InviteCode.objects.redeem(self.invite_code.code, self.admin))
+
+        self.invite_code.refresh_from_db()
+        self.assertFalse(self.invite_code.is_active)
+        self.assertEqual(self.invite_code.used_by, self.user)
+
+    def test_expired_code_is_rejected(self):
+        """Test that a code past its expiration date cannot be redeemed."""
+        InviteCode.objects.filter(pk=self.invite_code.pk).update(expires_at=timezone.now() - timedelta(minutes=1))
+
+        self.assertFalse(InviteCode.objects.redeem(self.invite_code.code, self.user))
+
+    def test_unknown_code_is_rejected(self):
+        """Test that a code which does not exist cannot be redeemed."""
+        self.assertFalse(InviteCode.objects.redeem("unknown", self.user))
+
+
+class DeactivateExpiredInviteCodesTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username="admin", password="supersecret")
+
+    def test_only_expired_codes_are_deactivated(self):
+        """Test that expired codes are deactivated in batches and other codes are left active."""
+        InviteCode.objects.generate(5, created_by=self.admin, expires_at=timezone.now() - timedelta(days=1))
+        InviteCode.objects.generate(2, created_by=self.admin, expires_at=timezone.now() + timedelta(days=1))
+        InviteCode.objects.generate(1, created_by=self.admin)
+
+        self.assertEqual(InviteCode.objects.deactivate_expired(batch_size=2), 5)
+        self.assertEqual(InviteCode.objects.filter(is_active=True).count(), 3)
+        self.assertEqual(InviteCode.objects.deactivate_expired(), 0)
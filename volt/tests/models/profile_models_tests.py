@@ -0,0 +1,64 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from volt.models import Profile
+
+
+class ProfileContributionCountsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpassword")
+        Profile.objects.filter(user=self.user).update(contribution_counts={})
+
+    def test_record_contribution(self):
+        """Test that created cards are counted by type."""
+        self.user.profile.record_contribution("Study")
+        self.user.profile.record_contribution("Study")
+        self.user.profile.record_contribution("Method")
+
+        self.user.profile.refresh_from_db()
+        self.assertDictEqual(self.user.profile.contribution_counts, {"Study": 2, "Method": 1})
+
+    def test_record_removed_contribution(self):
+        """Test that removed cards decrease the count and empty types are dropped."""
+        self.user.profile.record_contribution("Study")
+        self.user.profile.record_contribution("Method")
+        self.user.profile.record_contribution("Study", delta=-1)
+
+        self.user.profile.refresh_from_db()
+        self.assertDictEqual(self.user.profile.contribution_counts, {"Method": 1})
+
+    def test_record_contribution_without_counts(self):
+        """Test that a profile whose counts were never materialized is not counted from zero."""
+        Profile.objects.filter(user=self.user).update(contribution_counts=None)
+
+        self.user.profile.record_contribution("Study")
+
+        self.user.profile.refresh_from_db()
+        self.assertIsNone(self.user.profile.contribution_counts)
+
+
+class UpdateUserProfileSignalTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpassword")
+
+    def test_profile_is_created_with_user(self):
+        """Test that creating a user creates its profile."""
+        self.assertTrue(Profile.objects.filter(user=self.user).exists())
+
+    def test_login_runs_no_profile_queries(self):
+        """Test that logging in, which saves last_login on the user, does not query the profile."""
+        with CaptureQueriesContext(connection) as queries:
+            self.assertTrue(self.client.login(username="testuser", password="testpassword"))
+
+        profile_queries = [q["sql"] for q in queries if Profile._meta.db_table in q["sql"]]
+        self.assertEqual(profile_queries, [])
+
+    def test_loaded_profile_is_saved_with_user(self):
+        """Test that changes to a profile loaded on the user are saved along with the user."""
+        user = User.objects.get(pk=self.user.pk)
+        user.profile.user_info = {"name": "John"}
+        user.save()
+
+        self.assertDictEqual(Profile.objects.get(user=self.user).user_info, {"name": "John"})
@@ -0,0 +1,51 @@
+import json
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from volt.models import InviteCode
+
+
+class ExportInviteCodesViewTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username="admin", password="supersecret")
+        self.client.login(username="admin", password="supersecret")
+        self.batch = InviteCode.objects.generate(3, created_by=self.admin, source_event="Conference")
+        InviteCode.objects.generate(2, created_by=self.admin, source_event="Workshop")
+
+    def test_csv_export_of_batch(self):
+        """Test that a batch is streamed as CSV with a header row."""
+        response = self.client.get(
+            reverse("export_invite_codes"), {"batch": str(self.batch[0].batch_id), "format": "csv"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], "code,source_event,expires_at,is_active,created_at")
+        self.assertSetEqual({line.split(",")[0] for line in lines[1:]}, {code.code for code in self.batch})
+
+    def test_jsonl_export_of_source_event(self):
+        """Test that the codes of a source event are streamed as JSON Lines."""
+        response = self.client.get(reverse("export_invite_codes"), {"source_event": "Workshop", "format": "jsonl"})
+
+        records = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(len(records), 2)
+        self.assertTrue(all(record["source_event"] == "Workshop" for record in records))
+
+    def test_invalid_parameters(self):
+        """Test that unknown formats and malformed batches are rejected."""
+        self.assertEqual(self.client.get(reverse("export_invite_codes"), {"format": "xml"}).status_code, 400)
+        self.assertEqual(self.client.get(reverse("export_invite_codes"), {"batch": "nope"}).status_code, 400)
+
+    def test_non_staff_user_is_redirected(self):
+        """Test that only staff users can export invite codes."""
+        User.objects.create_user(username="user", password="secret")
+        self.client.login(username="user", password="secret")
+
+        response = self.client.get(reverse("export_invite_codes"))
+
+        self.assertRedirects(
+            response, f"/accounts/login/?next={reverse('export_invite_codes')}", fetch_redirect_response=False
+        )
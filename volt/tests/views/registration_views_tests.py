@@ -0,0 +1,45 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from volt.models import InviteCode
+
+
+class RegisterViewInviteCodeTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username="admin", password="supersecret")
+        self.post_data = {
+            "email": "newuser@example.com",
+            "password1": "Sup3r-secret-pass",
+            "password2": "Sup3r-secret-pass",
+        }
+
+    def test_expired_code_rolls_back_user(self):
+        """Test that registering with an expired code creates no user and leaves the code untouched."""
+        invite_code = InviteCode.objects.create(
+            created_by=self.admin, expires_at=timezone.now() - timedelta(days=1)
+        )
+
+        response = self.client.post(reverse("register"), data={**self.post_data, "invite_code": invite_code.code})
+
+        self.assertRedirects(response, "/accounts/register/", fetch_redirect_response=False)
+        self.assertFalse(User.objects.filter(username="newuser@example.com").exists())
+        invite_code.refresh_from_db()
+        self.assertTrue(invite_code.is_active)
+        self.assertIsNone(invite_code.used_by)
+
+    def test_used_code_is_rejected_before_creating_user(self):
+        """Test that a code that was already redeemed is turned away without any INSERT or transaction."""
+        invite_code = InviteCode.objects.create(created_by=self.admin, is_active=False, used_by=self.admin)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse("register"), data={**self.post_data, "invite_code": invite_code.code})
+
+        self.assertRedirects(response, "/accounts/register/", fetch_redirect_response=False)
+        self.assertFalse(User.objects.filter(username="newuser@example.com").exists())
+        self.assertFalse([q["sql"] for q in queries.captured_queries if q["sql"].startswith(("INSERT", "SAVEPOINT"))])
@@ -7,6 +7,7 @@ from volt import views
 urlpatterns = [
     # Admin
     path('admin/generate_invite_codes/', admin_views.generate_invite_codes_view, name='generate_invite_codes'),
+    path('admin/export_invite_codes/', admin_views.export_invite_codes_view, name='export_invite_codes'),
 
     # Index
     path("", views.index, name="index"),
@@ -1,12 +1,24 @@
 # from django.contrib import messages
+import csv
+import json
+import uuid
+
 from django.contrib.auth.decorators import login_required
+from django.contrib.auth.decorators import user_passes_test
+from django.core.serializers.json import DjangoJSONEncoder
 from django.http import HttpRequest
+from django.http import HttpResponseBadRequest
+from django.http import StreamingHttpResponse
 from django.shortcuts import render
-from django.utils.crypto import get_random_string
 
 from volt.forms.admin_forms import GenerateInviteCodesForm
 from volt.models import InviteCode
 
+# Codes listed on the page after a generation, the whole batch is available as a download
+INVITE_CODES_SHOWN = 100
+INVITE_CODE_EXPORT_FIELDS = ["code", "source_event", "expires_at", "is_active", "created_at"]
+INVITE_CODE_EXPORT_CHUNK_SIZE = 2000
+
 
 @login_required(login_url="/accounts/login/")
 def generate_invite_codes_view(request: HttpRequest):
@@ -18,20 +30,74 @@ def generate_invite_codes_view(request: HttpRequest):
             expires_at = form.cleaned_data['expires_at']
             created_by = request.user
 
-            codes = []
-            for _ in range(num_codes):
-                code = InviteCode.objects.create(
-                    source_event=source_event,
-                    created_by=created_by,
-                    expires_at=expires_at,
-                    code=get_random_string(15)
-                )
-                codes.append(code.code)
+            invite_codes = InviteCode.objects.generate(
+                num_codes,
+                created_by=created_by,
+                source_event=source_event,
+                expires_at=expires_at,
+            )
+            codes = [invite_code.code for invite_code in invite_codes[:INVITE_CODES_SHOWN]]
 
             # messages.success(request, "Invite codes generated successfully!")
-            return render(request, 'admin/invite_codes_generated.html', {'codes': codes})
+            return render(request, 'admin/invite_codes_generated.html', {
+                'codes': codes,
+                'num_codes': len(invite_codes),
+                'batch_id': invite_codes[0].batch_id if invite_codes else None,
+            })
 
     else:
         form = GenerateInviteCodesForm()
 
     return render(request, 'admin/generate_invite_codes.html', {'form': form})
+
+
+@user_passes_test(lambda user: user.is_staff, login_url="/accounts/login/")
+def export_invite_codes_view(request: HttpRequest):
+    """Stream invite codes as a CSV or JSON Lines download, to staff users only.
+
+    Codes are read from the database in chunks, so exporting a batch of any size keeps the memory of the worker flat.
+
+    Query parameters:
+        batch: Only export the codes of a bulk generation.
+        source_event: Only export the codes of a source event.
+        format: ``csv`` (default) or ``jsonl``.
+    """
+    export_format = request.GET.get("format", "csv")
+    if export_format not in ("csv", "jsonl"):
+        return HttpResponseBadRequest("Unsupported export format")
+
+    invite_codes = InviteCode.objects.order_by("pk")
+    if request.GET.get("batch"):
+        try:
+            invite_codes = invite_codes.filter(batch_id=uuid.UUID(request.GET["batch"]))
+        except ValueError:
+            return HttpResponseBadRequest("Invalid batch")
+    if request.GET.get("source_event"):
+        invite_codes = invite_codes.filter(source_event=request.GET["source_event"])
+
+    rows = invite_codes.values_list(*INVITE_CODE_EXPORT_FIELDS).iterator(chunk_size=INVITE_CODE_EXPORT_CHUNK_SIZE)
+    if export_format == "csv":
+        response = StreamingHttpResponse(_csv_lines(rows), content_type="text/csv")
+    else:
+        response = StreamingHttpResponse(_json_lines(rows), content_type="application/x-ndjson")
+    response["Content-Disposition"] = f'attachment; filename="invite_codes.{export_format}"'
+    return response
+
+
+class _Echo:
+    """File-like object that returns what is written to it, so ``csv.writer`` can produce lines one at a time."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def _csv_lines(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(INVITE_CODE_EXPORT_FIELDS)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def _json_lines(rows):
+    for row in rows:
+        yield json.dumps(dict(zip(INVITE_CODE_EXPORT_FIELDS, row)), cls=DjangoJSONEncoder) + "\n"
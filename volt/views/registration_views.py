@@ -7,13 +7,11 @@ from django.http import HttpRequest
 from django.shortcuts import redirect
 from django.shortcuts import render
 
-from home.agraph.agraph_models import GraphUser
-from home.agraph.user_manager import UserManager
 from volt.forms.registration_forms import RegistrationForm
+from volt.models import GraphUserOutbox
 from volt.models import InviteCode
 
 logger = logging.getLogger(__name__)
-user_manager = UserManager()
 
 
 def register_view(request: HttpRequest):
@@ -25,14 +23,15 @@ def register_view(request: HttpRequest):
     Steps:
     1. If the request method is POST:
         - Make the POST data mutable.
-        - Validate the invite code.
         - Assign the email as the username to bypass username validation.
         - Initialize the registration form with POST data.
         - If the form is valid:
+            - Check that the invite code can still be redeemed, before paying for the user INSERTs.
             - Set the username to the email address.
             - Save the user to the database.
+            - Redeem the invite code, rolling the user back if it is invalid, expired or already used.
             - Refresh user data from the database.
-            - Create a profile in the graph database using the user data.
+            - Queue the creation of the user in the graph database, see ``drain_graph_outbox``.
             - Log the successful account creation.
             - Redirect the user to the login page.
         - If the form is not valid, log the form errors.
@@ -49,21 +48,24 @@ def register_view(request: HttpRequest):
     """
     if request.method == "POST":
         invite_code = request.POST.get("invite_code")
-        if not invite_code_is_valid(invite_code):
-            messages.error(request, "Invalid invite code. Please try again.")
-            return redirect("/accounts/register/")
-
         request.POST = request.POST.copy()
         request.POST["username"] = request.POST.get("email")
         form = RegistrationForm(request.POST)
 
         if form.is_valid():
+            # Cheap read that turns most bad codes away without opening a transaction. The code can still be redeemed
+            # by a concurrent signup after it, so redeem stays the conditional UPDATE that decides.
+            if not InviteCode.objects.usable().filter(code=invite_code).exists():
+                return _invalid_invite_code(request, invite_code)
             with transaction.atomic():
                 form.instance.username = form.cleaned_data.get("email")
                 user: User = form.save()
+                if not InviteCode.objects.redeem(invite_code, user):
+                    # Roll the new user back, the code was invalid, expired or redeemed by a concurrent signup
+                    transaction.set_rollback(True)
+                    return _invalid_invite_code(request, invite_code)
                 user.refresh_from_db()
-                create_graph_user(user=user)
-                expire_invite_code(invite_code, user)
+                enqueue_graph_user(user=user)
                 logger.info(f"Account created for user {user.id}")
                 # messages.success(request, "You have been successfully registered. Please log in")
                 return redirect("/accounts/login/")
@@ -82,39 +84,20 @@ def register_view(request: HttpRequest):
     return render(request, "accounts/sign-up.html", context)
 
 
-def invite_code_is_valid(invite_code: str) -> bool:
-    """Validate the provided invite code.
+def _invalid_invite_code(request: HttpRequest, invite_code: str):
+    logger.info(f"Invite code {invite_code} is invalid")
+    messages.error(request, "Invalid invite code. Please try again.")
+    return redirect("/accounts/register/")
 
-    This function checks if the provided invite code is valid and active. It queries the InviteCode model to see if
-    the code exists and is marked as active.
 
-    Args:
-        invite_code (str): The invite code to validate.
+def enqueue_graph_user(user: User) -> None:
+    """Queue the creation of a user in the graph, in the transaction that creates the Django user.
 
-    Returns:
-        bool: True if the invite code is valid and active, False otherwise.
+    The graph write happens later, in ``drain_graph_outbox``, so the registration transaction is never held open
+    while waiting on AllegroGraph.
     """
-    try:
-        code = InviteCode.objects.get(code=invite_code)
-        return code.is_active
-    except Exception as e:
-        logger.info(f"Invite code {invite_code} is invalid: {e}")
-        return False
-
-
-def create_graph_user(user: User) -> None:
-    user_manager.create_user(GraphUser(
-        user_id=str(user.profile.graph_id),
-        django_id=str(user.id),
-        email=user.email
-    ))
-
-
-def expire_invite_code(invite_code: str, user: User) -> None:
-    try:
-        code = InviteCode.objects.get(code=invite_code)
-        code.used_by = user
-        code.is_active = False
-        code.save()
-    except Exception as e:
-        logger.info(f"Invite code {invite_code} is invalid: {e}")
+    GraphUserOutbox.objects.create(payload={
+        "user_id": str(user.profile.graph_id),
+        "django_id": str(user.id),
+        "email": user.email,
+    })